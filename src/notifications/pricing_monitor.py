@@ -8,19 +8,26 @@ alert when changes are found.
 Keeps exactly 2 files in data/:
   - pricing_previous.json  (last run's data)
   - pricing_current.json   (this run's data)
+plus meter_taxonomy.json, the parsed fields of every meter in pricing_current.json.
+With PRICING_SNAPSHOT_FORMAT=npz the two snapshots are columnar .npz files
+instead (see utils/snapshot_store.py).
 
 On each run:
   1. Fetch fresh pricing for all regions
   2. Compare against pricing_previous.json (if it exists)
   3. Send email if changes detected
-  4. Rotate: current -> previous, save new current
+  4. Rotate: current -> previous, save new current (and its meter taxonomy)
+  5. Append the rows that changed to the pricing history: the committed change
+     log data/pricing_history.jsonl, indexed in data/pricing_history.sqlite,
+     which keep every price seen across runs (see utils/price_history.py)
 
 Run manually: python src/notifications/pricing_monitor.py
 """
 
 import sys
 import os
-import json
+import time
+import asyncio
 from datetime import datetime, timezone
 
 # Path setup — allow imports from src/
@@ -30,56 +37,87 @@ from dotenv import load_dotenv
 load_dotenv(os.path.join(os.path.dirname(__file__), "..", "..", ".env"))
 
 from collections import defaultdict
-from providers.azure import fetch_pricing_as_list, fetch_available_regions
+from providers.azure import (
+    fetch_regions_pricing_async,
+    fetch_available_regions,
+    fetch_all_pricing_by_region,
+)
 from notifications.email_sender import send_html_email
-from utils.meter_parser import parse_meter, group_pricing
-
-# Paths to the two pricing files
-DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "data")
-PREVIOUS_PATH = os.path.join(DATA_DIR, "pricing_previous.json")
-CURRENT_PATH = os.path.join(DATA_DIR, "pricing_current.json")
+from utils.meter_parser import enrich_items, parse_meter_cache_info, group_pricing
+from utils.meter_taxonomy import load_taxonomy, save_taxonomy, TAXONOMY_PATH
+from utils.fingerprints import pricing_fingerprints
+from utils.pricing_diff import diff_pricing
+from utils.price_history import PriceHistory, HISTORY_PATH
+from utils.snapshot_store import (
+    CURRENT_SNAPSHOT_PATH,
+    PREVIOUS_SNAPSHOT_PATH,
+    convert_snapshot,
+    existing_snapshot_path,
+    load_snapshot,
+    other_format_paths,
+    save_snapshot,
+)
+
+# Paths to the two pricing files (data/pricing_{previous,current}.<PRICING_SNAPSHOT_FORMAT>)
+PREVIOUS_PATH = PREVIOUS_SNAPSHOT_PATH
+CURRENT_PATH = CURRENT_SNAPSHOT_PATH
+
+# "global": one pass over the OpenAI catalogue, split by region (discovers every region)
+# "regional": discover regions first, then crawl each region concurrently
+FETCH_MODE = os.environ.get("PRICING_FETCH_MODE", "global")
+
+# Max number of regions crawled at the same time (regional mode only)
+FETCH_CONCURRENCY = int(os.environ.get("PRICING_FETCH_CONCURRENCY", "8"))
+
+
+def fetch_all_pricing(mode=FETCH_MODE, max_concurrency=FETCH_CONCURRENCY):
+    """Fetch pricing for all available regions."""
+    if mode == "global":
+        return fetch_all_pricing_single_pass()
+    return fetch_all_pricing_per_region(max_concurrency)
 
 
-def load_json(path):
-    """Load a pricing JSON file. Returns None if it doesn't exist."""
-    if not os.path.exists(path):
-        return None
-    with open(path, "r") as f:
-        return json.load(f)
+def fetch_all_pricing_single_pass():
+    """Fetch the whole OpenAI catalogue once and partition it by region."""
+    print("Fetching pricing for all regions in a single catalogue pass...")
 
+    start = time.perf_counter()
+    all_prices, page_count = fetch_all_pricing_by_region()
+    wall_time = time.perf_counter() - start
 
-def save_json(path, prices):
-    """Save pricing data to a JSON file with timestamp."""
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    data = {
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "prices": prices,
-    }
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
-    print(f"Saved: {path}")
+    total = sum(len(v) for v in all_prices.values())
+    print(f"Fetched {total} pricing entries across {len(all_prices)} regions "
+          f"({page_count} pages) in {wall_time:.1f}s.")
+    return all_prices
 
 
-def fetch_all_pricing():
-    """Fetch pricing for all available regions."""
+def fetch_all_pricing_per_region(max_concurrency=FETCH_CONCURRENCY):
+    """Fetch pricing for all available regions, crawling regions concurrently."""
     regions = fetch_available_regions()
-    print(f"Fetching pricing for {len(regions)} regions...")
+    print(f"Fetching pricing for {len(regions)} regions (concurrency {max_concurrency})...")
+
+    start = time.perf_counter()
+    all_prices, timings = asyncio.run(fetch_regions_pricing_async(regions, max_concurrency))
+    wall_time = time.perf_counter() - start
 
-    all_prices = {}
     for region in regions:
-        print(f"  Fetching: {region}...")
-        items = fetch_pricing_as_list(region)
-        all_prices[region] = items
+        print(f"  {region}: {len(all_prices[region])} entries in {timings[region]:.1f}s")
 
     total = sum(len(v) for v in all_prices.values())
-    print(f"Fetched {total} pricing entries across {len(regions)} regions.")
+    print(f"Fetched {total} pricing entries across {len(regions)} regions "
+          f"in {wall_time:.1f}s (sequential would be ~{sum(timings.values()):.1f}s).")
     return all_prices
 
 
-def compare_pricing(previous_prices, current_prices):
+def compare_pricing(previous_prices, current_prices, previous_fingerprints=None, current_fingerprints=None):
     """
     Compare previous and current pricing to find changes.
 
+    Both snapshots are {region: [items]} (PriceEntry records or plain dicts)
+    or SnapshotColumns; the diff itself is a vectorized join (utils/pricing_diff.py).
+    When both snapshots' fingerprints are given, unchanged regions and models
+    are skipped.
+
     Returns a list of change dicts:
     {
         "region": str,
@@ -89,89 +127,10 @@ def compare_pricing(previous_prices, current_prices):
         "old_price": float | None,
         "new_price": float | None,
         "change_pct": float | None,
+        "group_key", "deployment", "tier", "direction", "display_name": str,
     }
     """
-    changes = []
-
-    # Get all regions from both snapshots
-    all_regions = set(list(previous_prices.keys()) + list(current_prices.keys()))
-
-    for region in sorted(all_regions):
-        prev_items = previous_prices.get(region, [])
-        curr_items = current_prices.get(region, [])
-
-        # Build lookup by Meter name
-        prev_by_meter = {item["Meter"]: item for item in prev_items}
-        curr_by_meter = {item["Meter"]: item for item in curr_items}
-
-        # Check for price changes and new meters
-        for meter, curr_item in curr_by_meter.items():
-            parsed = _enrich_item(curr_item)
-
-            if meter in prev_by_meter:
-                prev_price = prev_by_meter[meter]["Price"]
-                curr_price = curr_item["Price"]
-
-                if prev_price != curr_price and prev_price != "N/A" and curr_price != "N/A":
-                    if prev_price > 0:
-                        change_pct = ((curr_price - prev_price) / prev_price) * 100
-                    else:
-                        change_pct = 100.0
-
-                    changes.append({
-                        "region": region,
-                        "meter": meter,
-                        "product": curr_item.get("Product", ""),
-                        "change_type": "increased" if curr_price > prev_price else "decreased",
-                        "old_price": prev_price,
-                        "new_price": curr_price,
-                        "change_pct": round(change_pct, 2),
-                        **parsed,
-                    })
-            else:
-                changes.append({
-                    "region": region,
-                    "meter": meter,
-                    "product": curr_item.get("Product", ""),
-                    "change_type": "new",
-                    "old_price": None,
-                    "new_price": curr_item["Price"],
-                    "change_pct": None,
-                    **parsed,
-                })
-
-        # Check for removed meters
-        for meter, prev_item in prev_by_meter.items():
-            if meter not in curr_by_meter:
-                parsed = _enrich_item(prev_item)
-                changes.append({
-                    "region": region,
-                    "meter": meter,
-                    "product": prev_item.get("Product", ""),
-                    "change_type": "removed",
-                    "old_price": prev_item["Price"],
-                    "new_price": None,
-                    "change_pct": None,
-                    **parsed,
-                })
-
-    return changes
-
-
-def _enrich_item(item):
-    """Parse meter name into structured fields for grouping."""
-    parsed = parse_meter(
-        item.get("Meter", ""),
-        item.get("SkuName", ""),
-        item.get("Product", ""),
-    )
-    return {
-        "group_key": parsed.get("group_key", item.get("Meter", "")),
-        "deployment": parsed.get("deployment", ""),
-        "tier": parsed.get("tier", "Standard"),
-        "direction": parsed.get("direction", ""),
-        "display_name": parsed.get("display_name", item.get("Meter", "")),
-    }
+    return diff_pricing(previous_prices, current_prices, previous_fingerprints, current_fingerprints)
 
 
 def build_pricing_email_html(changes, prev_timestamp):
@@ -339,13 +298,7 @@ def build_no_change_email_html(current_prices, prev_timestamp):
     ref_region = "eastus" if "eastus" in current_prices else next(iter(current_prices))
     items = current_prices[ref_region]
 
-    # Enrich with parsed fields
-    enriched = []
-    for item in items:
-        parsed = parse_meter(item["Meter"], item.get("SkuName", ""), item["Product"])
-        enriched.append({**item, **parsed})
-
-    grouped = group_pricing(enriched)
+    grouped = group_pricing(enrich_items(items))
 
     prev_time = prev_timestamp or "N/A"
     curr_time = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
@@ -436,8 +389,11 @@ def build_no_change_email_html(current_prices, prev_timestamp):
 def main():
     print("=== Azure OpenAI Pricing Change Detector ===\n")
 
-    # Step 1: Load previous data (from pricing_previous.json)
-    previous = load_json(PREVIOUS_PATH)
+    # Known meters are answered from the taxonomy instead of being re-parsed
+    print(f"Meter taxonomy: {load_taxonomy()} meters loaded")
+
+    # Step 1: Load previous data (from pricing_previous.json / .npz)
+    previous = load_snapshot(PREVIOUS_PATH)
     is_first_run = previous is None
 
     if is_first_run:
@@ -447,11 +403,19 @@ def main():
 
     # Step 2: Fetch current pricing for all regions
     current_prices = fetch_all_pricing()
+    current_fingerprints = pricing_fingerprints(current_prices)
 
     # Step 3: Compare (skip on first run)
     if not is_first_run:
         prev_prices = previous.get("prices", {})
-        changes = compare_pricing(prev_prices, current_prices)
+        prev_fingerprints = previous.get("fingerprints")
+        if prev_fingerprints:
+            unchanged = sum(
+                1 for region, fp in current_fingerprints["regions"].items()
+                if prev_fingerprints["regions"].get(region, {}).get("hash") == fp["hash"]
+            )
+            print(f"Fingerprints: {unchanged} of {len(current_fingerprints['regions'])} regions unchanged")
+        changes = compare_pricing(prev_prices, current_prices, prev_fingerprints, current_fingerprints)
 
         if changes:
             increased = sum(1 for c in changes if c["change_type"] == "increased")
@@ -473,12 +437,35 @@ def main():
         print("\nSkipping comparison (first run).")
 
     # Step 4: Rotate files — current becomes previous, save new current
-    if os.path.exists(CURRENT_PATH):
+    current_source = existing_snapshot_path(CURRENT_PATH)
+    if current_source == CURRENT_PATH:
         # Move current -> previous (overwrite previous)
         os.replace(CURRENT_PATH, PREVIOUS_PATH)
-        print(f"Rotated: pricing_current.json -> pricing_previous.json")
-
-    save_json(CURRENT_PATH, current_prices)
+        print(f"Rotated: {os.path.basename(CURRENT_PATH)} -> {os.path.basename(PREVIOUS_PATH)}")
+    elif current_source is not None:
+        # PRICING_SNAPSHOT_FORMAT changed: carry the old current over in the new format
+        convert_snapshot(current_source, PREVIOUS_PATH)
+        os.remove(current_source)
+        print(f"Rotated: {os.path.basename(current_source)} -> {os.path.basename(PREVIOUS_PATH)} (converted)")
+    # Keep exactly 2 snapshot files: drop leftovers in the other format
+    for stale in other_format_paths(PREVIOUS_PATH):
+        if os.path.exists(stale):
+            os.remove(stale)
+            print(f"Removed: {os.path.basename(stale)}")
+
+    observed_at = datetime.now(timezone.utc).isoformat()
+    save_snapshot(CURRENT_PATH, current_prices, observed_at, current_fingerprints)
+    print(f"Saved: {CURRENT_PATH}")
+    total, newly_parsed = save_taxonomy(current_prices)
+    print(f"Saved: {TAXONOMY_PATH} ({total} meters, {newly_parsed} newly parsed)")
+
+    # Step 5: Append this run's changed rows to the long-term history
+    with PriceHistory(HISTORY_PATH) as history:
+        written = history.record_snapshot(observed_at, current_prices)
+    print(f"History: {written} rows appended to {history.log_path}")
+
+    stats = parse_meter_cache_info()
+    print(f"Meter parser cache: {stats.hits} hits, {stats.misses} misses ({stats.currsize} distinct meters)")
     print("\nDone.")
 
 
@@ -19,29 +19,36 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 from dotenv import load_dotenv
 load_dotenv(os.path.join(os.path.dirname(__file__), "..", "..", ".env"))
 
-from providers.azure import fetch_model_retirements
-from utils.table_parser import parse_retirement_tables
-from utils.date_parser import extract_retirement_date
+from providers.azure import close_msft_mcp_pool
+from providers.retirements import get_retirement_document
 from notifications.email_sender import send_html_email
 
 DAYS_THRESHOLD = 60
 
 
+async def _fetch_retirements():
+    """Fetch the (cached) retirement document, closing the MCP pool before the loop ends."""
+    try:
+        return await get_retirement_document()
+    finally:
+        await close_msft_mcp_pool()
+
+
 def get_upcoming_retirements():
     """Fetch retirement data and filter to models retiring within threshold."""
-    raw_data = asyncio.run(fetch_model_retirements())
-    df = parse_retirement_tables(raw_data)
+    doc = asyncio.run(_fetch_retirements())
 
-    if df.empty:
+    if not doc.rows:
         return []
 
     today = date.today()
     cutoff = today + timedelta(days=DAYS_THRESHOLD)
     upcoming = []
 
-    for _, row in df.iterrows():
+    # Rows are parsed once per distinct document; RetirementDate is pre-extracted
+    for row in doc.rows:
         raw = row.get("Retirement", "")
-        retirement_date = extract_retirement_date(raw)
+        retirement_date = row["RetirementDate"]
         if retirement_date and today <= retirement_date <= cutoff:
             is_tentative = any(x in raw.lower() for x in [
                 "no earlier", "not retire before", "as early as"
@@ -1,32 +1,114 @@
 # this program is to connect with Microsoft docs as MCP client and fetch relevant details
 
-from mcp.client.streamable_http import streamable_http_client
-from mcp import ClientSession
+import asyncio
+import json
+import os
+import time
+from collections import defaultdict
 import httpx
 
+from providers.mcp_pool import McpSessionPool
+from utils.http_cache import CACHE_ROOT, DiskCache
+from utils.records import PriceEntry
+
 client = httpx.Client()
 
+# Disk cache for Retail Prices pages, keyed by page URL (including NextPageLink pages)
+pricing_cache = DiskCache(
+    os.path.join(CACHE_ROOT, "retail-prices"),
+    ttl=int(os.environ.get("AZURE_PRICING_CACHE_TTL", "3600")),
+    max_bytes=int(os.environ.get("AZURE_PRICING_CACHE_MAX_MB", "100")) * 1024 * 1024,
+)
+
 MSFT_MCP_URL = "https://learn.microsoft.com/api/mcp"
 
+# Long-lived sessions to the Microsoft Learn MCP server, shared by the MCP server and reminder.py
+msft_mcp_pool = McpSessionPool(
+    MSFT_MCP_URL,
+    size=int(os.environ.get("MSFT_MCP_POOL_SIZE", "2")),
+    idle_timeout=float(os.environ.get("MSFT_MCP_IDLE_TIMEOUT", "300")),
+)
+
 async def fetch_model_retirements():
     """Fetch the Azure model retirements via Microsoft Learn MCP Server."""
     url = "https://learn.microsoft.com/en-us/azure/ai-foundry/openai/concepts/model-retirements"
     return await fetch_from_msft_mcp(url)
 
 
+def _group_items(items):
+    """Parse meter names and group price items by model, deployment type, and tier."""
+    from utils.meter_parser import enrich_items, group_pricing
+
+    return group_pricing(enrich_items(items))
+
+
+def fetch_grouped_pricing(region: str):
+    """Fetch Azure OpenAI pricing for a region as {model: {deployment: {tier: {direction: price}}}}."""
+    return _group_items(fetch_pricing_as_list(region))
+
+
+async def fetch_grouped_pricing_async(region: str):
+    """
+    Async counterpart of fetch_grouped_pricing. Never blocks the event loop:
+    HTTP is awaited, and the disk cache, JSON decoding and meter parsing run
+    in worker threads.
+    """
+    async with httpx.AsyncClient(timeout=30.0) as async_client:
+        items = await fetch_pricing_as_list_async(region, async_client)
+    return await asyncio.to_thread(_group_items, items)
+
+
 def fetch_model_pricing(region: str):
     """Fetch Azure OpenAI model pricing for a region, grouped by model, deployment type, and tier."""
-    from utils.meter_parser import parse_meter, group_pricing, format_grouped_pricing_text
+    from utils.meter_parser import format_grouped_pricing_text
 
-    items = fetch_pricing_as_list(region)
+    return format_grouped_pricing_text(fetch_grouped_pricing(region))
+
+def _cached_page(url):
+    """Return (cache entry, decoded page); the page is None unless the entry is fresh."""
+    entry = pricing_cache.get(url)
+    if pricing_cache.is_fresh(entry):
+        return entry, json.loads(entry["body"])
+    return entry, None
+
+
+def _get_pricing_page(url):
+    """GET one Retail Prices page, serving it from the disk cache when possible."""
+    entry, data = _cached_page(url)
+    if data is not None:
+        return data
+
+    # httpx.Request + send keeps $filter from being double-encoded
+    request = httpx.Request("GET", url, headers=pricing_cache.validator_headers(entry))
+    response = client.send(request, follow_redirects=True)
+    return _handle_page_response(url, entry, response)
 
-    # Enrich with parsed fields
-    for item in items:
-        parsed = parse_meter(item['Meter'], item.get('SkuName', ''), item['Product'])
-        item.update(parsed)
 
-    grouped = group_pricing(items)
-    return format_grouped_pricing_text(grouped)
+async def _get_pricing_page_async(url, async_client):
+    """Async counterpart of _get_pricing_page; cache file I/O and JSON decoding run in a worker thread."""
+    entry, data = await asyncio.to_thread(_cached_page, url)
+    if data is not None:
+        return data
+
+    request = httpx.Request("GET", url, headers=pricing_cache.validator_headers(entry))
+    response = await async_client.send(request, follow_redirects=True)
+    return await asyncio.to_thread(_handle_page_response, url, entry, response)
+
+
+def _handle_page_response(url, entry, response):
+    """
+    Reuse the cached body on 304, store successful responses. Errors (429,
+    5xx, ...) raise httpx.HTTPStatusError: decoding an error body as a page
+    would end the crawl early and make the missing meters look removed.
+    """
+    if response.status_code == 304 and entry:
+        pricing_cache.touch(entry)
+        return json.loads(entry["body"])
+    response.raise_for_status()
+    if response.status_code == 200:
+        pricing_cache.put(url, response.text, response.headers)
+    return response.json()
+
 
 def fetch_available_regions():
     """Fetch all Azure regions that have OpenAI pricing data."""
@@ -34,9 +116,7 @@ def fetch_available_regions():
     regions = set()
     page_count = 0
     while url and page_count < 5:
-        request = httpx.Request("GET", url)
-        response = client.send(request, follow_redirects=True)
-        data = response.json()
+        data = _get_pricing_page(url)
         for item in data.get('Items', []):
             region = item.get('armRegionName', '')
             if region:
@@ -46,37 +126,110 @@ def fetch_available_regions():
     return sorted(regions)
 
 
+OPENAI_PRICING_URL = "https://prices.azure.com/api/retail/prices?$filter=contains(productName, 'OpenAI')"
+
+
+def _regional_pricing_url(region: str):
+    """Build the Retail Prices API URL for all OpenAI meters in one region."""
+    return f"{OPENAI_PRICING_URL} and armRegionName eq '{region}'"
+
+
+def _to_price_list(items):
+    """Sort raw API items by meterName and reduce them to the fields we keep."""
+    items.sort(key=lambda x: x.get('meterName', ''))
+
+    results = []
+    for item in items:
+        results.append(PriceEntry(
+            Meter=item.get('meterName', 'N/A'),
+            Price=item.get('retailPrice', 'N/A'),
+            Unit=item.get('unitOfMeasure', 'N/A'),
+            Product=item.get('productName', 'N/A'),
+            SkuName=item.get('skuName', ''),
+        ))
+    return results
+
+
 def fetch_pricing_as_list(region: str):
-    """Fetch Azure OpenAI pricing as a list of dicts."""
-    url = f"https://prices.azure.com/api/retail/prices?$filter=contains(productName, 'OpenAI') and armRegionName eq '{region}'"
+    """Fetch Azure OpenAI pricing as a list of PriceEntry records (dict-compatible)."""
+    url = _regional_pricing_url(region)
 
     items = []
     while url:
-        request = httpx.Request("GET", url)
-        response = client.send(request, follow_redirects=True)
-        data = response.json()
+        data = _get_pricing_page(url)
         url = data.get('NextPageLink')
         items.extend(data.get('Items', []))
 
-    # Sort by meterName and return structured data
-    items.sort(key=lambda x: x.get('meterName', ''))
+    return _to_price_list(items)
+
+
+def fetch_all_pricing_by_region():
+    """
+    Page through the whole OpenAI catalogue once and split items by armRegionName.
+
+    Returns ({region: [items]}, page_count). Regions are discovered from the
+    items themselves, so there is no separate (capped) region lookup.
+    """
+    url = OPENAI_PRICING_URL
+    by_region = defaultdict(list)
+    page_count = 0
+    while url:
+        data = _get_pricing_page(url)
+        for item in data.get('Items', []):
+            region = item.get('armRegionName', '')
+            if region:
+                by_region[region].append(item)
+        url = data.get('NextPageLink')
+        page_count += 1
+
+    prices = {region: _to_price_list(by_region[region]) for region in sorted(by_region)}
+    return prices, page_count
 
-    results = []
-    for item in items:
-        results.append({
-            'Meter': item.get('meterName', 'N/A'),
-            'Price': item.get('retailPrice', 'N/A'),
-            'Unit': item.get('unitOfMeasure', 'N/A'),
-            'Product': item.get('productName', 'N/A'),
-            'SkuName': item.get('skuName', ''),
-        })
-    return results
+
+async def fetch_pricing_as_list_async(region: str, async_client: httpx.AsyncClient):
+    """Async counterpart of fetch_pricing_as_list, paging over a shared AsyncClient."""
+    url = _regional_pricing_url(region)
+
+    items = []
+    while url:
+        data = await _get_pricing_page_async(url, async_client)
+        url = data.get('NextPageLink')
+        items.extend(data.get('Items', []))
+
+    return await asyncio.to_thread(_to_price_list, items)
+
+
+async def fetch_regions_pricing_async(regions, max_concurrency: int = 8):
+    """
+    Fetch pricing for many regions in parallel, at most max_concurrency at a time.
+
+    Returns (prices, timings):
+        prices:  {region: [items]} in the same order as `regions`
+        timings: {region: seconds spent crawling that region}
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    limits = httpx.Limits(max_connections=max_concurrency)
+
+    async with httpx.AsyncClient(timeout=30.0, limits=limits) as async_client:
+        async def _fetch(region):
+            async with semaphore:
+                start = time.perf_counter()
+                items = await fetch_pricing_as_list_async(region, async_client)
+                return region, items, time.perf_counter() - start
+
+        results = await asyncio.gather(*(_fetch(region) for region in regions))
+
+    prices = {region: items for region, items, _ in results}
+    timings = {region: elapsed for region, _, elapsed in results}
+    return prices, timings
 
 
 async def fetch_from_msft_mcp(url: str):
     """Reusable helper to fetch any doc from Microsoft MCP Server."""
-    async with streamable_http_client(MSFT_MCP_URL) as (read, write, _):
-        async with ClientSession(read, write) as session:
-            await session.initialize()
-            result = await session.call_tool("microsoft_docs_fetch", {"url": url})
-            return result.content[0].text
\ No newline at end of file
+    result = await msft_mcp_pool.call_tool("microsoft_docs_fetch", {"url": url})
+    return result.content[0].text
+
+
+async def close_msft_mcp_pool():
+    """Close pooled Microsoft Learn MCP sessions. Call before the event loop shuts down."""
+    await msft_mcp_pool.close()
@@ -0,0 +1,180 @@
+"""
+Pooled MCP Client Sessions
+
+Keeps MCP client sessions to a remote server open across calls, so each call
+costs one `call_tool` round-trip instead of connection setup plus a full
+`initialize()` handshake.
+
+- Each session is owned by a background task that holds its transport open,
+  because the underlying async context managers must be entered and exited
+  from the same task.
+- Sessions unused for `health_check_after` seconds are pinged before reuse.
+- Sessions idle longer than `idle_timeout` seconds are closed.
+- A call that fails on a pooled session is retried once on a new connection;
+  the other idle sessions are dropped too, since whatever broke the first
+  one (e.g. a server restart) has most likely broken them as well.
+- The pool binds to the running event loop; a new loop (e.g. a second
+  `asyncio.run`) starts from an empty pool.
+"""
+
+import asyncio
+import time
+
+from mcp import ClientSession
+from mcp.client.streamable_http import streamable_http_client
+
+
+class PooledSession:
+    """One long-lived MCP session whose transport is held open by a background task."""
+
+    def __init__(self, url):
+        self.url = url
+        self.session = None
+        self.last_used = time.monotonic()
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._task = None
+        self._error = None
+
+    async def open(self, timeout):
+        self._task = asyncio.create_task(self._run())
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            await self.close()
+            raise
+        if self.session is None:
+            raise self._error or ConnectionError(f"Could not open MCP session to {self.url}")
+
+    async def _run(self):
+        try:
+            async with streamable_http_client(self.url) as (read, write, _):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    self.session = session
+                    self._ready.set()
+                    await self._closing.wait()
+        except Exception as e:
+            self._error = e
+        finally:
+            self.session = None
+            self._ready.set()
+
+    @property
+    def alive(self):
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    def shutdown(self):
+        """Ask the owner task to close the session without waiting for it."""
+        self._closing.set()
+
+    async def close(self, timeout=5.0):
+        self._closing.set()
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            pass
+
+
+class McpSessionPool:
+    def __init__(self, url, size=2, idle_timeout=300.0, health_check_after=60.0, connect_timeout=30.0):
+        self.url = url
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.health_check_after = health_check_after
+        self.connect_timeout = connect_timeout
+        self._loop = None
+        self._idle = []
+        self._slots = None
+        self._reaper = None
+
+    def _bind_loop(self):
+        """(Re)initialize pool state if we're running on a different event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._idle = []
+            self._slots = asyncio.Semaphore(self.size)
+            self._reaper = loop.create_task(self._reap_idle())
+
+    async def _reap_idle(self):
+        """Close sessions that have been idle longer than idle_timeout."""
+        while True:
+            await asyncio.sleep(max(self.idle_timeout / 2, 1.0))
+            now = time.monotonic()
+            expired = [s for s in self._idle if now - s.last_used > self.idle_timeout]
+            for s in expired:
+                self._idle.remove(s)
+                await s.close()
+
+    async def _healthy(self, s):
+        if not s.alive:
+            return False
+        if time.monotonic() - s.last_used < self.health_check_after:
+            return True
+        try:
+            await asyncio.wait_for(s.session.send_ping(), self.connect_timeout)
+            return True
+        except Exception:
+            return False
+
+    async def _acquire(self, fresh=False):
+        """A healthy session: an idle one, or a new connection (always, if fresh)."""
+        self._bind_loop()
+        await self._slots.acquire()
+        try:
+            if fresh:
+                stale, self._idle = self._idle, []
+                for s in stale:
+                    s.shutdown()
+            while self._idle:
+                s = self._idle.pop()
+                if await self._healthy(s):
+                    return s
+                s.shutdown()
+            s = PooledSession(self.url)
+            await s.open(self.connect_timeout)
+            return s
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _release(self, s, healthy):
+        s.last_used = time.monotonic()
+        self._slots.release()
+        if healthy and s.alive:
+            self._idle.append(s)
+        else:
+            s.shutdown()
+
+    async def call_tool(self, name, arguments):
+        """Call a tool on a pooled session; on failure, retry once on a new connection."""
+        for attempt in range(2):
+            s = await self._acquire(fresh=attempt > 0)
+            try:
+                result = await s.session.call_tool(name, arguments)
+            except Exception:
+                self._release(s, healthy=False)
+                if attempt:
+                    raise
+                continue
+            except BaseException:
+                # Cancelled mid-call: the session may have a dangling request, don't reuse it
+                self._release(s, healthy=False)
+                raise
+            self._release(s, healthy=True)
+            return result
+
+    async def close(self):
+        """Close every idle session and stop the idle reaper."""
+        if self._loop is not asyncio.get_running_loop():
+            return
+        if self._reaper:
+            self._reaper.cancel()
+            self._reaper = None
+        idle, self._idle = self._idle, []
+        for s in idle:
+            await s.close()
+        self._loop = None
@@ -0,0 +1,126 @@
+"""
+Retirement Document Cache
+
+Caches the Azure OpenAI model-retirements page (fetched via the Microsoft
+Learn MCP server) in memory and on disk, together with its parsed table rows.
+
+- The raw markdown is stored with a SHA-256 content hash and a fetch time.
+- Within RETIREMENT_CACHE_TTL seconds the cached document is served as-is.
+- After that the page is fetched again, but the tables are only re-parsed
+  (parse_retirement_tables + extract_retirement_date) if the hash changed.
+- If a refresh fails, the last good document keeps being served.
+"""
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import date
+
+from providers.azure import fetch_model_retirements
+from utils.http_cache import CACHE_ROOT
+
+RETIREMENT_CACHE_PATH = os.path.join(CACHE_ROOT, "retirements.json")
+RETIREMENT_CACHE_TTL = float(os.environ.get("RETIREMENT_CACHE_TTL", "3600"))
+
+
+@dataclass
+class RetirementDocument:
+    markdown: str
+    content_hash: str
+    fetched_at: float
+    # Rows from parse_retirement_tables, each with an extra "RetirementDate" (date or None)
+    rows: list
+
+    def dataframe(self):
+        """Parsed rows as a DataFrame (same columns as parse_retirement_tables, plus RetirementDate)."""
+        import pandas as pd
+
+        return pd.DataFrame(self.rows)
+
+
+_document = None
+
+
+def _content_hash(markdown):
+    return hashlib.sha256(markdown.encode("utf-8")).hexdigest()
+
+
+def _parse_rows(markdown):
+    """Parse the retirement tables and pre-extract each row's retirement date."""
+    from utils.table_parser import parse_retirement_tables
+    from utils.date_parser import extract_retirement_date
+
+    df = parse_retirement_tables(markdown)
+    rows = df.to_dict("records") if not df.empty else []
+    for row in rows:
+        row["RetirementDate"] = extract_retirement_date(row.get("Retirement", ""))
+    return rows
+
+
+def _load_from_disk(path=RETIREMENT_CACHE_PATH):
+    """Read the cached document back; None if it is missing, unreadable or malformed."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    try:
+        for row in data["rows"]:
+            if row.get("RetirementDate"):
+                row["RetirementDate"] = date.fromisoformat(row["RetirementDate"])
+        return RetirementDocument(data["markdown"], data["content_hash"], float(data["fetched_at"]), data["rows"])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        # A truncated or older-format file is just a cache miss
+        return None
+
+
+def _save_to_disk(doc, path=RETIREMENT_CACHE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    rows = [
+        {**row, "RetirementDate": row["RetirementDate"].isoformat() if row.get("RetirementDate") else None}
+        for row in doc.rows
+    ]
+    data = {
+        "markdown": doc.markdown,
+        "content_hash": doc.content_hash,
+        "fetched_at": doc.fetched_at,
+        "rows": rows,
+    }
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+async def get_retirement_document(force_refresh=False):
+    """Return the cached RetirementDocument, refreshing it from Microsoft Learn when expired."""
+    global _document
+
+    doc = _document or _load_from_disk()
+    if doc and not force_refresh and time.time() - doc.fetched_at < RETIREMENT_CACHE_TTL:
+        _document = doc
+        return doc
+
+    try:
+        markdown = await fetch_model_retirements()
+    except Exception:
+        if doc:
+            _document = doc
+            return doc
+        raise
+
+    content_hash = _content_hash(markdown)
+    if doc and doc.content_hash == content_hash:
+        # Unchanged page: keep the parsed rows, just restart the TTL
+        doc.fetched_at = time.time()
+    else:
+        doc = RetirementDocument(markdown, content_hash, time.time(), _parse_rows(markdown))
+
+    _document = doc
+    try:
+        _save_to_disk(doc)
+    except OSError:
+        pass
+    return doc
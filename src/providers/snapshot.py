@@ -0,0 +1,53 @@
+"""
+Pricing Snapshot Provider
+
+Serves Azure OpenAI pricing from the weekly snapshot written by the pricing
+monitor (data/pricing_current.json, or .npz with PRICING_SNAPSHOT_FORMAT=npz) instead of
+the Retail Prices API.
+
+The snapshot is loaded once and every region is parsed and grouped up front,
+so lookups are dictionary reads and need no network access.
+"""
+
+from utils.meter_parser import enrich_items, group_pricing, format_grouped_pricing_text
+from utils.snapshot_store import CURRENT_SNAPSHOT_PATH, load_snapshot
+
+SNAPSHOT_PATH = CURRENT_SNAPSHOT_PATH
+
+
+class PricingSnapshot:
+    def __init__(self, timestamp, grouped_by_region):
+        self.timestamp = timestamp
+        self.grouped_by_region = grouped_by_region
+        self._text_by_region = {}
+
+    @classmethod
+    def load(cls, path=SNAPSHOT_PATH):
+        """Load a snapshot file (.json or .npz) and index it by region. Returns None if it doesn't exist."""
+        data = load_snapshot(path)
+        if data is None:
+            return None
+
+        grouped_by_region = {}
+        for region, items in data.get("prices", {}).items():
+            grouped_by_region[region.lower()] = group_pricing(enrich_items(items))
+
+        return cls(data.get("timestamp", "unknown"), grouped_by_region)
+
+    @property
+    def regions(self):
+        return sorted(self.grouped_by_region)
+
+    def grouped(self, region):
+        """Grouped pricing for a region, or None if the snapshot doesn't cover it."""
+        return self.grouped_by_region.get(region.strip().lower())
+
+    def text(self, region):
+        """Formatted pricing text for a region, or None if the snapshot doesn't cover it."""
+        region = region.strip().lower()
+        if region not in self._text_by_region:
+            grouped = self.grouped_by_region.get(region)
+            if grouped is None:
+                return None
+            self._text_by_region[region] = format_grouped_pricing_text(grouped)
+        return self._text_by_region[region]
@@ -2,18 +2,53 @@
 Cloud AI Service Status Fetcher
 
 Monitors outage status for 5 AI cloud providers:
-- OpenAI (statuspage.io JSON API)
-- Anthropic/Claude (statuspage.io JSON API)
+- OpenAI (statuspage.io summary.json: status, components and incidents in one request)
+- Anthropic/Claude (statuspage.io summary.json)
 - AWS Bedrock (RSS feed)
 - Azure AI (RSS feed)
-- GCP Vertex AI (JSON endpoint)
+- GCP Vertex AI (JSON endpoint, streamed: only the newest incidents are read)
+
+All providers are checked concurrently on one async client:
+- each provider has its own time budget (STATUS_PROVIDER_TIMEOUT)
+- a provider still pending after STATUS_HEDGE_AFTER seconds (or failing
+  before then) gets a second, racing attempt; the first success wins
+- the whole check ends by STATUS_CHECK_DEADLINE; providers without an
+  answer by their budget or the deadline are reported as UNKNOWN
+
+Requests are conditional (If-None-Match / If-Modified-Since, from
+.cache/status/). When a page hasn't changed since the last check, the
+server answers 304 with no body and the parse stored with the validators
+is reused.
 """
 
+import asyncio
+import os
+import time
 import httpx
-import feedparser
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from typing import Awaitable, Callable
+
+from utils.http_cache import CACHE_ROOT, DiskCache
+from utils.json_stream import aiter_json_array
+from utils.rss_reader import aiter_rss_items
+
+# Seconds before the whole check returns, whatever is still pending
+STATUS_CHECK_DEADLINE = float(os.environ.get("STATUS_CHECK_DEADLINE", "20"))
+# Seconds one provider may take, including a hedged second attempt
+STATUS_PROVIDER_TIMEOUT = float(os.environ.get("STATUS_PROVIDER_TIMEOUT", "15"))
+# Seconds before a slow attempt is raced by a second one (0 disables hedging)
+STATUS_HEDGE_AFTER = float(os.environ.get("STATUS_HEDGE_AFTER", "5"))
+
+# Validators and parse results of the last response per status URL. ttl=0: every
+# check revalidates, and a 304 reuses the parse instead of downloading the page
+status_cache = DiskCache(os.path.join(CACHE_ROOT, "status"), ttl=0, max_bytes=10 * 1024 * 1024)
+
+# Shape of the cached parse results. Bump it whenever a parser's output
+# changes: entries from another version (e.g. restored by CI caching) are
+# ignored and the page is downloaded and parsed again.
+STATUS_PARSE_VERSION = 1
 
 
 class ServiceHealth(Enum):
@@ -33,228 +68,387 @@ class ProviderStatus:
     incidents: list = field(default_factory=list)
     status_page_url: str = ""
     error: str = None
+    # Monitored components, as {"name": ..., "status": ...} (statuspage.io providers only)
+    components: list = field(default_factory=list)
+
 
+@dataclass
+class StatusSource:
+    """One provider: fetch(async_client) returns its ProviderStatus, raising on failure."""
+    provider: str
+    status_page_url: str
+    fetch: Callable[[httpx.AsyncClient], Awaitable[ProviderStatus]]
+
+
+def _unknown_status(source, description, error):
+    return ProviderStatus(
+        provider=source.provider,
+        status=ServiceHealth.UNKNOWN,
+        description=description,
+        last_checked=datetime.utcnow(),
+        status_page_url=source.status_page_url,
+        error=error,
+    )
 
-client = httpx.Client(timeout=15.0, follow_redirects=True)
+
+async def _get_parsed(async_client, url, parse):
+    """
+    GET url with the validators of its cached entry. On 304 return the cached
+    parse result; otherwise return parse(response), caching it (it must be
+    JSON-serializable) when the server sent an ETag or Last-Modified.
+
+    A plain parse function gets the fully read response. An async one gets
+    the response still streaming, and may stop reading early.
+
+    Cached results are stamped with STATUS_PARSE_VERSION and the parser's
+    name; an entry with a different stamp counts as a miss.
+    """
+    parse_format = f"{STATUS_PARSE_VERSION}:{parse.__name__}"
+    entry = status_cache.get(url)
+    body = entry.get("body") if entry else None
+    if not (isinstance(body, dict) and body.get("format") == parse_format):
+        entry = None
+    async with async_client.stream("GET", url, headers=status_cache.validator_headers(entry)) as resp:
+        if resp.status_code == 304 and entry:
+            return body["parsed"]
+        if asyncio.iscoroutinefunction(parse):
+            parsed = await parse(resp)
+        else:
+            await resp.aread()
+            parsed = parse(resp)
+    if resp.status_code == 200 and ("etag" in resp.headers or "last-modified" in resp.headers):
+        status_cache.put(url, {"format": parse_format, "parsed": parsed}, resp.headers)
+    return parsed
+
+
+def _feed_status(provider, status_page_url, parsed):
+    """ProviderStatus for a feed parsed into {"incidents": [...], "has_active": bool}."""
+    has_active = parsed["has_active"]
+    return ProviderStatus(
+        provider=provider,
+        status=ServiceHealth.DEGRADED if has_active else ServiceHealth.OPERATIONAL,
+        description="Active incidents detected" if has_active else "All Systems Operational",
+        last_checked=datetime.utcnow(),
+        incidents=parsed["incidents"],
+        status_page_url=status_page_url,
+    )
 
 
 # --- statuspage.io providers (OpenAI, Anthropic) ---
 
-def _fetch_statuspage(api_url, provider_name, status_page_url):
-    """Generic handler for statuspage.io providers."""
-    try:
-        resp = client.get(api_url)
-        data = resp.json()
-        indicator = data.get("status", {}).get("indicator", "none")
-        description = data.get("status", {}).get("description", "Unknown")
-
-        status_map = {
-            "none": ServiceHealth.OPERATIONAL,
-            "minor": ServiceHealth.DEGRADED,
-            "major": ServiceHealth.PARTIAL_OUTAGE,
-            "critical": ServiceHealth.MAJOR_OUTAGE,
-        }
-        health = status_map.get(indicator, ServiceHealth.UNKNOWN)
-
-        # Fetch unresolved incidents
-        incidents = []
-        try:
-            inc_url = api_url.replace("status.json", "incidents/unresolved.json")
-            inc_resp = client.get(inc_url)
-            inc_data = inc_resp.json()
-            for inc in inc_data.get("incidents", []):
-                incidents.append({
-                    "title": inc.get("name", ""),
-                    "status": inc.get("status", ""),
-                    "created_at": inc.get("created_at", ""),
-                    "url": inc.get("shortlink", ""),
-                })
-        except Exception:
-            pass
-
-        return ProviderStatus(
-            provider=provider_name,
-            status=health,
-            description=description,
-            last_checked=datetime.utcnow(),
-            incidents=incidents,
-            status_page_url=status_page_url,
-        )
-    except Exception as e:
-        return ProviderStatus(
-            provider=provider_name,
-            status=ServiceHealth.UNKNOWN,
-            description="Failed to fetch status",
-            last_checked=datetime.utcnow(),
-            status_page_url=status_page_url,
-            error=str(e),
+# Components whose name contains one of these (case-insensitive) decide the provider's health
+OPENAI_COMPONENT_KEYWORDS = [
+    "api", "completions", "responses", "realtime", "batch", "embeddings", "fine-tuning", "files",
+    "moderations", "audio", "image",
+]
+ANTHROPIC_COMPONENT_KEYWORDS = ["api"]
+
+# Page-level indicator -> health, used when no component matches the keywords
+INDICATOR_HEALTH = {
+    "none": ServiceHealth.OPERATIONAL,
+    "minor": ServiceHealth.DEGRADED,
+    "major": ServiceHealth.PARTIAL_OUTAGE,
+    "critical": ServiceHealth.MAJOR_OUTAGE,
+}
+
+# Component status -> health; a provider takes the worst of its monitored components
+COMPONENT_HEALTH = {
+    "operational": ServiceHealth.OPERATIONAL,
+    "under_maintenance": ServiceHealth.DEGRADED,
+    "degraded_performance": ServiceHealth.DEGRADED,
+    "partial_outage": ServiceHealth.PARTIAL_OUTAGE,
+    "major_outage": ServiceHealth.MAJOR_OUTAGE,
+}
+HEALTH_SEVERITY = [
+    ServiceHealth.OPERATIONAL, ServiceHealth.DEGRADED, ServiceHealth.PARTIAL_OUTAGE, ServiceHealth.MAJOR_OUTAGE,
+]
+
+
+def _parse_statuspage_summary(resp):
+    data = resp.json()
+    return {
+        "indicator": data.get("status", {}).get("indicator", "none"),
+        "description": data.get("status", {}).get("description", "Unknown"),
+        "components": [
+            {"name": comp.get("name", ""), "status": comp.get("status", "")}
+            for comp in data.get("components", [])
+            if not comp.get("group")  # groups only aggregate their children
+        ],
+        "incidents": [
+            {
+                "title": inc.get("name", ""),
+                "status": inc.get("status", ""),
+                "created_at": inc.get("created_at", ""),
+                "url": inc.get("shortlink", ""),
+            }
+            for inc in data.get("incidents", [])
+        ],
+    }
+
+
+async def _fetch_statuspage(async_client, api_url, provider_name, status_page_url, component_keywords):
+    """
+    Generic handler for statuspage.io providers: one summary.json request
+    gives the page status, its components and the unresolved incidents.
+    """
+    summary = await _get_parsed(async_client, api_url, _parse_statuspage_summary)
+
+    components = [
+        comp for comp in summary["components"]
+        if any(kw in comp["name"].lower() for kw in component_keywords)
+    ]
+    if components:
+        # A component status this map doesn't know counts as degraded
+        health = max(
+            (COMPONENT_HEALTH.get(comp["status"], ServiceHealth.DEGRADED) for comp in components),
+            key=HEALTH_SEVERITY.index,
         )
+        affected = [comp for comp in components if comp["status"] != "operational"]
+        if affected:
+            description = ", ".join(
+                f"{comp['name']}: {comp['status'].replace('_', ' ')}" for comp in affected
+            )
+        elif summary["indicator"] != "none":
+            description = f"{summary['description']} (monitored components operational)"
+        else:
+            description = summary["description"]
+    else:
+        health = INDICATOR_HEALTH.get(summary["indicator"], ServiceHealth.UNKNOWN)
+        description = summary["description"]
+
+    return ProviderStatus(
+        provider=provider_name,
+        status=health,
+        description=description,
+        last_checked=datetime.utcnow(),
+        incidents=summary["incidents"],
+        status_page_url=status_page_url,
+        components=components,
+    )
 
 
-def fetch_openai_status():
-    return _fetch_statuspage(
-        "https://status.openai.com/api/v2/status.json",
+async def _fetch_openai(async_client):
+    return await _fetch_statuspage(
+        async_client,
+        "https://status.openai.com/api/v2/summary.json",
         "OpenAI",
         "https://status.openai.com",
+        OPENAI_COMPONENT_KEYWORDS,
     )
 
 
-def fetch_anthropic_status():
-    return _fetch_statuspage(
-        "https://status.anthropic.com/api/v2/status.json",
+async def _fetch_anthropic(async_client):
+    return await _fetch_statuspage(
+        async_client,
+        "https://status.anthropic.com/api/v2/summary.json",
         "Anthropic (Claude)",
         "https://status.anthropic.com",
+        ANTHROPIC_COMPONENT_KEYWORDS,
     )
 
 
 # --- AWS Bedrock (RSS feed) ---
 
-def fetch_aws_bedrock_status():
-    """Parse AWS Bedrock RSS feed for outage info."""
-    try:
-        feed = feedparser.parse(
-            "https://status.aws.amazon.com/rss/bedrock-us-east-1.rss"
-        )
-        incidents = []
-        has_active_issue = False
+# Newest feed items checked per RSS provider; the feed is not read past them
+FEED_ITEM_LIMIT = 10
 
-        for entry in feed.entries[:10]:
-            title = entry.get("title", "")
-            summary = entry.get("summary", "")
-            published = entry.get("published", "")
-            link = entry.get("link", "")
 
-            incidents.append({
-                "title": title,
-                "status": "reported",
-                "created_at": published,
-                "url": link,
-            })
+async def _parse_aws_bedrock_feed(resp):
+    incidents = []
+    has_active_issue = False
 
-            if "operating normally" not in summary.lower():
-                has_active_issue = True
+    async for entry in aiter_rss_items(resp.aiter_bytes(), limit=FEED_ITEM_LIMIT):
+        title = entry["title"]
+        summary = entry["summary"]
+        published = entry["published"]
+        link = entry["link"]
 
-        status = ServiceHealth.DEGRADED if has_active_issue else ServiceHealth.OPERATIONAL
-        description = "Active incidents detected" if has_active_issue else "All Systems Operational"
+        incidents.append({
+            "title": title,
+            "status": "reported",
+            "created_at": published,
+            "url": link,
+        })
+
+        if "operating normally" not in summary.lower():
+            has_active_issue = True
+
+    return {"incidents": incidents, "has_active": has_active_issue}
 
-        return ProviderStatus(
-            provider="AWS Bedrock",
-            status=status,
-            description=description,
-            last_checked=datetime.utcnow(),
-            incidents=incidents,
-            status_page_url="https://health.aws.amazon.com/health/status",
-        )
-    except Exception as e:
-        return ProviderStatus(
-            provider="AWS Bedrock",
-            status=ServiceHealth.UNKNOWN,
-            description="Failed to fetch status",
-            last_checked=datetime.utcnow(),
-            status_page_url="https://health.aws.amazon.com/health/status",
-            error=str(e),
-        )
+
+async def _fetch_aws_bedrock(async_client):
+    """Parse AWS Bedrock RSS feed for outage info."""
+    parsed = await _get_parsed(
+        async_client, "https://status.aws.amazon.com/rss/bedrock-us-east-1.rss", _parse_aws_bedrock_feed
+    )
+    return _feed_status("AWS Bedrock", "https://health.aws.amazon.com/health/status", parsed)
 
 
 # --- Azure AI (RSS feed) ---
 
-def fetch_azure_ai_status():
+async def _parse_azure_feed(resp):
+    incidents = []
+    has_active = False
+
+    async for entry in aiter_rss_items(resp.aiter_bytes(), limit=FEED_ITEM_LIMIT):
+        title = entry["title"]
+        summary = entry["summary"]
+        incidents.append({
+            "title": title,
+            "status": "reported",
+            "created_at": entry["published"],
+            "url": entry["link"],
+        })
+        if "resolved" not in summary.lower():
+            has_active = True
+
+    return {"incidents": incidents, "has_active": has_active}
+
+
+async def _fetch_azure_ai(async_client):
     """Fetch Azure AI status from Azure status RSS feed."""
-    try:
-        resp = client.get("https://azure.status.microsoft/en-us/status/feed")
-        feed = feedparser.parse(resp.text)
-        incidents = []
-        has_active = False
-
-        for entry in feed.entries[:10]:
-            title = entry.get("title", "")
-            summary = entry.get("summary", "")
+    parsed = await _get_parsed(async_client, "https://azure.status.microsoft/en-us/status/feed", _parse_azure_feed)
+    return _feed_status("Azure AI", "https://azure.status.microsoft/en-us/status", parsed)
+
+
+# --- GCP Vertex AI (JSON endpoint) ---
+
+# incidents.json lists every incident GCP has had; only the most recent ones are checked
+GCP_INCIDENT_WINDOW = 20
+
+
+async def _parse_gcp_incidents(resp):
+    """Filter the first GCP_INCIDENT_WINDOW incidents (newest first) as they stream in."""
+    ai_keywords = ["vertex", "ai platform", "machine learning", "ml", "gemini"]
+    incidents = []
+    has_active = False
+
+    seen = 0
+    async for inc in aiter_json_array(resp.aiter_text()):
+        service = inc.get("service_name", "").lower()
+        if any(kw in service for kw in ai_keywords):
+            is_resolved = inc.get("end", "") != ""
             incidents.append({
-                "title": title,
-                "status": "reported",
-                "created_at": entry.get("published", ""),
-                "url": entry.get("link", ""),
+                "title": inc.get("external_desc", ""),
+                "status": "resolved" if is_resolved else "active",
+                "created_at": inc.get("begin", ""),
+                "url": f"https://status.cloud.google.com/incidents/{inc.get('number', '')}",
             })
-            if "resolved" not in summary.lower():
+            if not is_resolved:
                 has_active = True
+        seen += 1
+        if seen == GCP_INCIDENT_WINDOW:
+            break  # the rest of the history is never downloaded
 
-        status = ServiceHealth.DEGRADED if has_active else ServiceHealth.OPERATIONAL
-        description = "Active incidents detected" if has_active else "All Systems Operational"
+    return {"incidents": incidents, "has_active": has_active}
 
-        return ProviderStatus(
-            provider="Azure AI",
-            status=status,
-            description=description,
-            last_checked=datetime.utcnow(),
-            incidents=incidents,
-            status_page_url="https://azure.status.microsoft/en-us/status",
-        )
-    except Exception as e:
-        return ProviderStatus(
-            provider="Azure AI",
-            status=ServiceHealth.UNKNOWN,
-            description="Failed to fetch status",
-            last_checked=datetime.utcnow(),
-            status_page_url="https://azure.status.microsoft/en-us/status",
-            error=str(e),
-        )
 
+async def _fetch_gcp_vertex(async_client):
+    """Fetch GCP Vertex AI status from Google Cloud incidents JSON."""
+    parsed = await _get_parsed(async_client, "https://status.cloud.google.com/incidents.json", _parse_gcp_incidents)
+    return _feed_status("GCP Vertex AI", "https://status.cloud.google.com", parsed)
 
-# --- GCP Vertex AI (JSON endpoint) ---
 
-def fetch_gcp_vertex_status():
-    """Fetch GCP Vertex AI status from Google Cloud incidents JSON."""
+OPENAI = StatusSource("OpenAI", "https://status.openai.com", _fetch_openai)
+ANTHROPIC = StatusSource("Anthropic (Claude)", "https://status.anthropic.com", _fetch_anthropic)
+AWS_BEDROCK = StatusSource("AWS Bedrock", "https://health.aws.amazon.com/health/status", _fetch_aws_bedrock)
+AZURE_AI = StatusSource("Azure AI", "https://azure.status.microsoft/en-us/status", _fetch_azure_ai)
+GCP_VERTEX = StatusSource("GCP Vertex AI", "https://status.cloud.google.com", _fetch_gcp_vertex)
+
+STATUS_SOURCES = [OPENAI, ANTHROPIC, AWS_BEDROCK, AZURE_AI, GCP_VERTEX]
+
+
+# --- Concurrent fan-out ---
+
+async def _hedged(fetch, async_client, hedge_after):
+    """
+    Run fetch(async_client). If it is still pending after hedge_after seconds,
+    or fails before then, start one more attempt; return the first success.
+    """
+    pending = {asyncio.create_task(fetch(async_client))}
+    spare = 1 if hedge_after else 0
+    error = None
     try:
-        resp = client.get("https://status.cloud.google.com/incidents.json")
-        data = resp.json()
-
-        ai_keywords = ["vertex", "ai platform", "machine learning", "ml", "gemini"]
-        incidents = []
-        has_active = False
-
-        for inc in data[:20]:
-            service = inc.get("service_name", "").lower()
-            if any(kw in service for kw in ai_keywords):
-                is_resolved = inc.get("end", "") != ""
-                incidents.append({
-                    "title": inc.get("external_desc", ""),
-                    "status": "resolved" if is_resolved else "active",
-                    "created_at": inc.get("begin", ""),
-                    "url": f"https://status.cloud.google.com/incidents/{inc.get('number', '')}",
-                })
-                if not is_resolved:
-                    has_active = True
-
-        status = ServiceHealth.DEGRADED if has_active else ServiceHealth.OPERATIONAL
-        description = "Active incidents detected" if has_active else "All Systems Operational"
-
-        return ProviderStatus(
-            provider="GCP Vertex AI",
-            status=status,
-            description=description,
-            last_checked=datetime.utcnow(),
-            incidents=incidents,
-            status_page_url="https://status.cloud.google.com",
-        )
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, timeout=hedge_after if spare else None, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+            if spare and (not done or not pending):
+                pending.add(asyncio.create_task(fetch(async_client)))
+                spare -= 1
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _check(source, async_client, budget, hedge_after):
+    try:
+        return await asyncio.wait_for(_hedged(source.fetch, async_client, hedge_after), budget)
+    except asyncio.TimeoutError:
+        return _unknown_status(source, f"No response within {budget:g}s", "timeout")
     except Exception as e:
-        return ProviderStatus(
-            provider="GCP Vertex AI",
-            status=ServiceHealth.UNKNOWN,
-            description="Failed to fetch status",
-            last_checked=datetime.utcnow(),
-            status_page_url="https://status.cloud.google.com",
-            error=str(e),
-        )
+        return _unknown_status(source, "Failed to fetch status", str(e))
+
+
+async def fetch_all_statuses_async(
+    sources=None,
+    deadline=STATUS_CHECK_DEADLINE,
+    provider_timeout=STATUS_PROVIDER_TIMEOUT,
+    hedge_after=STATUS_HEDGE_AFTER,
+):
+    """
+    Check all sources (default: the 5 providers) concurrently. Returns their
+    ProviderStatus list in order, within `deadline` seconds.
+    """
+    sources = STATUS_SOURCES if sources is None else sources
+    budget = min(provider_timeout, deadline)
+    started = time.monotonic()
+
+    async with httpx.AsyncClient(timeout=budget, follow_redirects=True) as async_client:
+        tasks = [asyncio.create_task(_check(source, async_client, budget, hedge_after)) for source in sources]
+        # Budgets end every check in time; the deadline is the backstop
+        await asyncio.wait(tasks, timeout=max(0.0, deadline - (time.monotonic() - started)))
+
+        statuses = []
+        for source, task in zip(sources, tasks):
+            if task.done():
+                statuses.append(task.result())
+            else:
+                task.cancel()
+                statuses.append(_unknown_status(source, f"No response within {deadline:g}s", "timeout"))
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return statuses
 
 
-# --- Unified fetcher ---
-
 def fetch_all_statuses():
     """Fetch status from all 5 AI cloud providers."""
-    return [
-        fetch_openai_status(),
-        fetch_anthropic_status(),
-        fetch_aws_bedrock_status(),
-        fetch_azure_ai_status(),
-        fetch_gcp_vertex_status(),
-    ]
+    return asyncio.run(fetch_all_statuses_async())
+
+
+def _fetch_one(source):
+    return asyncio.run(fetch_all_statuses_async([source]))[0]
+
+
+def fetch_openai_status():
+    return _fetch_one(OPENAI)
+
+
+def fetch_anthropic_status():
+    return _fetch_one(ANTHROPIC)
+
+
+def fetch_aws_bedrock_status():
+    return _fetch_one(AWS_BEDROCK)
+
+
+def fetch_azure_ai_status():
+    return _fetch_one(AZURE_AI)
+
+
+def fetch_gcp_vertex_status():
+    return _fetch_one(GCP_VERTEX)
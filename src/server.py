@@ -1,8 +1,153 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+
 from mcp.server.fastmcp import FastMCP
-from providers.azure import fetch_model_pricing, fetch_model_retirements
+from providers.azure import fetch_grouped_pricing_async, close_msft_mcp_pool
+from providers.retirements import get_retirement_document
+from providers.snapshot import PricingSnapshot
+from utils.meter_parser import format_grouped_pricing_text
+from utils.meter_taxonomy import load_taxonomy
+
+
+@asynccontextmanager
+async def lifespan(server):
+    """Close pooled Microsoft Learn MCP sessions when the server shuts down."""
+    try:
+        yield
+    finally:
+        await close_msft_mcp_pool()
+
 
 #this is mcp server name
-mcp = FastMCP("model-intel")
+mcp = FastMCP("model-intel", lifespan=lifespan)
+
+# stdout carries the MCP protocol, so diagnostics go through logging (stderr)
+logger = logging.getLogger("model-intel")
+
+# Seconds a cached region stays fresh. Older entries are still served, but trigger a background refresh.
+PRICING_CACHE_TTL = float(os.environ.get("PRICING_CACHE_TTL", "900"))
+
+# Most regions kept in memory; the least recently used one is dropped beyond this
+PRICING_CACHE_MAX_REGIONS = int(os.environ.get("PRICING_CACHE_MAX_REGIONS", "64"))
+
+# Upper bound on one region's upstream crawl
+PRICING_FETCH_TIMEOUT = float(os.environ.get("PRICING_FETCH_TIMEOUT", "60"))
+
+# "live": always query the Retail Prices API (through the cache below)
+# "snapshot": answer from data/pricing_current.json, query the API only for regions it doesn't cover
+PRICING_SOURCE = os.environ.get("PRICING_SOURCE", "live")
+
+# Meters listed in data/meter_taxonomy.json are never re-parsed
+load_taxonomy()
+
+# Loaded once at startup in snapshot mode
+pricing_snapshot = PricingSnapshot.load() if PRICING_SOURCE == "snapshot" else None
+
+
+@dataclass
+class PricingEntry:
+    grouped: dict
+    text: str
+    fetched_at: float
+    refreshing: bool = False
+
+
+# region -> PricingEntry, in least-recently-used order
+_pricing_cache = OrderedDict()
+
+# Strong references to in-flight refresh tasks so they aren't garbage collected
+_background_tasks = set()
+
+# In-flight upstream operations, keyed by (operation, args)
+_inflight = {}
+
+
+@contextmanager
+def _timed(tool_name):
+    """Log how long one tool invocation took."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        logger.info("%s took %.1f ms", tool_name, (time.perf_counter() - start) * 1000)
+
+
+async def _single_flight(key, make_coro):
+    """
+    Run make_coro() once per key at a time. Concurrent callers with the same key
+    share the in-flight operation and all receive its result (or exception).
+    """
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(make_coro())
+        _inflight[key] = future
+        future.add_done_callback(lambda _: _inflight.pop(key, None))
+    # shield: one caller giving up must not cancel the operation for the others
+    return await asyncio.shield(future)
+
+
+async def _load_pricing(region):
+    """Fetch, parse and format one region's pricing."""
+    grouped = await asyncio.wait_for(fetch_grouped_pricing_async(region), PRICING_FETCH_TIMEOUT)
+    return PricingEntry(grouped, format_grouped_pricing_text(grouped), time.monotonic())
+
+
+def _remember_pricing(region, entry):
+    """
+    Cache a region's entry, evicting the least recently used regions past
+    PRICING_CACHE_MAX_REGIONS. Empty results (e.g. a misspelled region) are
+    not cached, so arbitrary region names can't fill the cache.
+    """
+    if not entry.grouped:
+        return
+    _pricing_cache[region] = entry
+    _pricing_cache.move_to_end(region)
+    while len(_pricing_cache) > PRICING_CACHE_MAX_REGIONS:
+        _pricing_cache.popitem(last=False)
+
+
+async def _refresh_pricing(region, stale):
+    """Background refresh of a stale region; the stale entry keeps serving if this fails."""
+    try:
+        entry = await _load_pricing(region)
+    except Exception as e:
+        logger.warning("Background pricing refresh for %s failed: %s", region, e)
+        stale.refreshing = False
+        return
+    if not entry.grouped:
+        logger.warning("Background pricing refresh for %s returned no prices; keeping the cached entry", region)
+        stale.refreshing = False
+        return
+    _remember_pricing(region, entry)
+
+
+async def get_cached_pricing(region):
+    """
+    Return the cached PricingEntry for a region (stale-while-revalidate).
+
+    Fresh entries are returned as-is. Stale entries are returned immediately while
+    a background task refreshes them. Only a cold miss waits on the network.
+    """
+    region = region.strip().lower()
+    entry = _pricing_cache.get(region)
+    if entry:
+        _pricing_cache.move_to_end(region)
+        if not entry.refreshing and time.monotonic() - entry.fetched_at >= PRICING_CACHE_TTL:
+            entry.refreshing = True
+            task = asyncio.create_task(_refresh_pricing(region, entry))
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+        return entry
+
+    entry = await _single_flight(("pricing", region), lambda: _load_pricing(region))
+    _remember_pricing(region, entry)
+    return entry
+
 
 #Decorator registers this function as an MCP tool. Any MCP client can now discover and call it.
 #The docstring becomes the tool's description — clients use it to understand what the tool does
@@ -16,16 +161,25 @@ def hello_checker() -> str:
 async def get_model_summary(provider: str) -> str:
     """this brings model information from the provider given as input by user."""
     if provider.lower() == "azure":
-        result = await fetch_model_retirements()
-        return result
+        with _timed("get_model_summary"):
+            doc = await _single_flight(("summary", "azure"), get_retirement_document)
+        return doc.markdown
     else:
         return f"Provider '{provider}' is not supported. Please use 'azure'."
 
 @mcp.tool()
-def get_model_pricing(region: str) -> str:
+async def get_model_pricing(region: str) -> str:
     """this brings model pricing information from the provider given as input by user. Returns pricing grouped by model, deployment type (Global/DataZone/Regional), and tier (Standard/Provisioned/Batch)."""
-    result = fetch_model_pricing(region)
-    return result
+    with _timed("get_model_pricing"):
+        if pricing_snapshot is not None:
+            text = pricing_snapshot.text(region)
+            if text is not None:
+                return f"Pricing snapshot from {pricing_snapshot.timestamp}\n{text}"
+        try:
+            entry = await get_cached_pricing(region)
+        except asyncio.TimeoutError:
+            return f"Timed out after {PRICING_FETCH_TIMEOUT:g}s fetching pricing for region '{region}'. Please try again."
+        return entry.text
 
 if __name__ == "__main__":
     # Start the MCP server. It will listen for incoming requests and handle them using the registered tools.
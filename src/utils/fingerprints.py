@@ -0,0 +1,54 @@
+"""
+Pricing Snapshot Fingerprints
+
+Content hashes stored with each snapshot so the weekly diff can skip work:
+
+    {
+        "parser_version": "...",            # meter_parser.PARSER_VERSION used for model grouping
+        "regions": {
+            "eastus": {
+                "hash": "...",              # all rows of the region, in order
+                "models": {"GPT-4o": "...", ...}   # rows of each group_key, in order
+            },
+            ...
+        }
+    }
+
+Two regions (or models) with equal hashes have identical rows: same meters,
+prices, units, products and SKUs in the same order.
+"""
+
+import hashlib
+from collections import defaultdict
+
+from utils.meter_parser import PARSER_VERSION, parse_meter
+from utils.records import price_entries
+
+# Hex digits kept per hash (64 bits; collisions are not a practical concern here)
+FINGERPRINT_LENGTH = 16
+
+
+def _row_bytes(item):
+    return f"{item.Meter}\x1f{item.Price!r}\x1f{item.Unit}\x1f{item.Product}\x1f{item.SkuName}\n".encode("utf-8")
+
+
+def region_fingerprint(items):
+    """Region hash plus per-model (group_key) hashes for one region's rows."""
+    region_hash = hashlib.sha256()
+    model_hashes = defaultdict(hashlib.sha256)
+    for item in price_entries(items):
+        row = _row_bytes(item)
+        region_hash.update(row)
+        model_hashes[parse_meter(item.Meter, item.SkuName, item.Product).group_key].update(row)
+    return {
+        "hash": region_hash.hexdigest()[:FINGERPRINT_LENGTH],
+        "models": {model: h.hexdigest()[:FINGERPRINT_LENGTH] for model, h in sorted(model_hashes.items())},
+    }
+
+
+def pricing_fingerprints(prices):
+    """Fingerprints for a {region: [items]} snapshot."""
+    return {
+        "parser_version": PARSER_VERSION,
+        "regions": {region: region_fingerprint(items) for region, items in prices.items()},
+    }
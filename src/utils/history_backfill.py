@@ -0,0 +1,179 @@
+"""
+Pricing History Backfill
+
+Builds the pricing history (utils/price_history.py) from the snapshots the
+weekly workflow has committed to git. Every version of
+data/pricing_{previous,current}.{json,npz} reachable from HEAD is listed
+with one `git log`, then a process pool reads, parses and diffs
+consecutive versions while the main process appends each result to the
+history, oldest first:
+
+  - each worker task is a (previous blob, blob) pair and returns only the
+    changed rows, so little crosses the process boundary and the main
+    process just inserts
+  - results are consumed in order as they arrive; no more than a few
+    parsed snapshots are alive at a time
+  - the history is rebuilt in a fresh database, and snapshots it already
+    holds that aren't in git (e.g. recorded by the monitor before the
+    backfill ever ran) are merged back in time order, so older weeks are
+    imported however new the existing history is; re-running with nothing
+    new leaves the history untouched
+
+Run from project root:
+    python src/utils/history_backfill.py [history.sqlite]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Path setup — allow running as a script
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from utils.price_history import HISTORY_PATH, PriceHistory, normalize_timestamp, price_state, state_changes
+from utils.snapshot_store import decode_snapshot
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# Older file first: within one commit, the rotated-out snapshot predates the new one
+SNAPSHOT_PATHS = [
+    "data/pricing_previous.json", "data/pricing_previous.npz",
+    "data/pricing_current.json", "data/pricing_current.npz",
+]
+
+# Tasks handed to a worker at once; consecutive tasks share a blob, which the worker parses once
+CHUNK_SIZE = 8
+
+EMPTY_BLOB = "0" * 40
+
+
+def snapshot_blobs(repo=REPO_ROOT, paths=SNAPSHOT_PATHS):
+    """
+    Every distinct version of the snapshot files in HEAD's history, oldest
+    commit first, as [(blob sha, path)].
+    """
+    log = subprocess.run(
+        ["git", "log", "--reverse", "--format=>%H", "--raw", "--no-abbrev", "--no-renames", "--", *paths],
+        cwd=repo, capture_output=True, text=True, check=True,
+    ).stdout
+
+    blobs, seen = [], set()
+    commit = []
+    for line in log.splitlines() + [">"]:
+        if line.startswith(">"):
+            commit.sort(key=lambda blob: paths.index(blob[1]))
+            for sha, path in commit:
+                if sha not in seen:
+                    seen.add(sha)
+                    blobs.append((sha, path))
+            commit = []
+        elif line.startswith(":"):
+            # :<old mode> <new mode> <old sha> <new sha> <status>\t<path>
+            fields, path = line.split("\t", 1)
+            sha = fields.split()[3]
+            if sha != EMPTY_BLOB:
+                commit.append((sha, path))
+    return blobs
+
+
+def _read_snapshot(repo, sha, path):
+    raw = subprocess.run(["git", "cat-file", "blob", sha], cwd=repo, capture_output=True, check=True).stdout
+    return decode_snapshot(raw, path)
+
+
+# Per-worker cache of the last parsed blob: (sha, timestamp, state, row count)
+_last_parsed = (None, None, None, 0)
+
+
+def _parse_blob(repo, sha, path):
+    global _last_parsed
+    if _last_parsed[0] != sha:
+        data = _read_snapshot(repo, sha, path)
+        row_count = sum(len(items) for items in data["prices"].values())
+        _last_parsed = (sha, data["timestamp"], price_state(data["prices"]), row_count)
+    return _last_parsed
+
+
+def _diff_blobs(task):
+    """
+    Worker: diff blob against previous (None for the first one).
+    Returns (timestamp, previous timestamp, row count, changed rows).
+    """
+    repo, previous, blob = task
+    before, previous_timestamp = None, None
+    if previous is not None:
+        _, previous_timestamp, before, _ = _parse_blob(repo, *previous)
+    _, timestamp, after, row_count = _parse_blob(repo, *blob)
+    if timestamp is None:
+        return None, previous_timestamp, row_count, []
+    return timestamp, previous_timestamp, row_count, state_changes(before, after, timestamp)
+
+
+def _reapply(rebuilt, history, timestamp):
+    """Record a snapshot that only the existing history holds into the rebuilt one."""
+    rebuilt.record_snapshot(timestamp, history.prices_at(timestamp))
+    return timestamp
+
+
+def backfill_history(history, repo=REPO_ROOT, paths=SNAPSHOT_PATHS, workers=None):
+    """
+    Rebuild the history from every committed snapshot, keeping the snapshots
+    it already holds: both are merged oldest first into a fresh database,
+    which then replaces the history's contents.
+
+    Returns the number of snapshots added; with none, the history is left as is.
+    """
+    blobs = snapshot_blobs(repo, paths)
+    print(f"   Found {len(blobs)} snapshot versions in git history")
+    if not blobs:
+        return 0
+
+    tasks = [(repo, previous, blob) for previous, blob in zip([None] + blobs[:-1], blobs)]
+    existing = history.snapshot_times()
+    pending = deque(existing)  # recorded snapshots not yet merged
+    added = 0
+    latest = None
+    with tempfile.TemporaryDirectory() as tmp, PriceHistory(os.path.join(tmp, "rebuilt.sqlite")) as rebuilt:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for (_, previous, (sha, path)), (timestamp, previous_timestamp, row_count, rows) in zip(
+                tasks, pool.map(_diff_blobs, tasks, chunksize=CHUNK_SIZE)
+            ):
+                if timestamp is None:
+                    print(f"   ⚠ Skipping {path} @ {sha[:8]}: no timestamp")
+                    continue
+                timestamp = normalize_timestamp(timestamp)
+                while pending and pending[0] < timestamp:
+                    latest = _reapply(rebuilt, history, pending.popleft())
+                if pending and pending[0] == timestamp:
+                    pending.popleft()  # already recorded; the committed copy is the same snapshot
+                elif latest is None or timestamp > latest:
+                    added += 1
+                if latest is not None and timestamp <= latest:
+                    continue  # a repeated or out-of-order version
+                if (previous is None and latest is None) or (
+                    previous_timestamp is not None and normalize_timestamp(previous_timestamp) == latest
+                ):
+                    rebuilt.record_changes(timestamp, row_count, rows)
+                else:
+                    # The worker diffed against a snapshot that isn't the latest recorded one
+                    # (a merged-in snapshot, or a skipped version): diff here
+                    rebuilt.record_snapshot(timestamp, _read_snapshot(repo, sha, path)["prices"])
+                latest = timestamp
+
+        while pending:
+            _reapply(rebuilt, history, pending.popleft())
+        if added:
+            history.replace_with(rebuilt)
+    return added
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else HISTORY_PATH
+    started = time.perf_counter()
+    with PriceHistory(path) as history:
+        count = backfill_history(history)
+    print(f"   Added {count} snapshots to {path} in {time.perf_counter() - started:.1f}s")
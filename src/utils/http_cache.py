@@ -0,0 +1,132 @@
+"""
+Disk-backed HTTP Response Cache
+
+Stores response bodies on disk keyed by request URL so repeated crawls of the
+same pages can be served locally.
+
+- Entries younger than `ttl` seconds are served without touching the network.
+- Older entries are revalidated with If-None-Match / If-Modified-Since when the
+  server sent an ETag or Last-Modified header; a 304 refreshes the entry.
+- When the cache grows past `max_bytes`, the least recently stored entries are
+  evicted first.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+CACHE_ROOT = os.path.join(os.path.dirname(__file__), "..", "..", ".cache")
+
+
+def _file_size(path):
+    """Size of a file, or 0 if it doesn't exist (e.g. another process just evicted it)."""
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+
+
+class DiskCache:
+    def __init__(self, cache_dir, ttl=3600, max_bytes=100 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._size = None
+
+    def _path(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, url):
+        """Return the stored entry for a URL, or None if it isn't cached."""
+        try:
+            with open(self._path(url), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Guard against (astronomically unlikely) hash collisions
+        return entry if entry.get("url") == url else None
+
+    def is_fresh(self, entry):
+        """True if the entry can be served without revalidation."""
+        return entry is not None and time.time() - entry["stored_at"] < self.ttl
+
+    def validator_headers(self, entry):
+        """Conditional request headers for revalidating an entry."""
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(self, url, body, headers):
+        """Store a 200 response body (or any JSON-serializable parse of it) along with its validators."""
+        entry = {
+            "url": url,
+            "stored_at": time.time(),
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "body": body,
+        }
+        self._write(url, entry)
+        return entry
+
+    def touch(self, entry):
+        """Mark an entry as fresh again after a 304 Not Modified."""
+        entry["stored_at"] = time.time()
+        self._write(entry["url"], entry)
+
+    def _write(self, url, entry):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(url)
+        old_size = _file_size(path)
+
+        # Unique per thread too: the async fetchers write from worker threads
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+        if self._size is None:
+            self._size = self._disk_usage()
+        else:
+            self._size += _file_size(path) - old_size
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _entries(self):
+        """(mtime, size, path) of every cache file, skipping files removed while scanning."""
+        entries = []
+        for e in os.scandir(self.cache_dir):
+            if not e.name.endswith(".json"):
+                continue
+            try:
+                st = e.stat()
+            except FileNotFoundError:
+                # Evicted or replaced by another process or thread
+                continue
+            entries.append((st.st_mtime, st.st_size, e.path))
+        return entries
+
+    def _disk_usage(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        """Delete the oldest entries until the cache fits in max_bytes."""
+        entries = self._entries()
+        entries.sort()
+
+        size = sum(size for _, size, _ in entries)
+        for _, entry_size, path in entries:
+            if size <= self.max_bytes:
+                break
+            size -= entry_size
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._size = size
@@ -0,0 +1,104 @@
+"""
+Streaming JSON Array Parser
+
+Yields the items of a top-level JSON array as its text arrives in chunks,
+so a caller that only needs the first few items can stop reading the rest
+of a large document:
+
+    for incident in iter_json_array(chunks):          # any iterable of str
+        ...
+    async for incident in aiter_json_array(resp.aiter_text()):
+        ...
+
+Each item is decoded with json.JSONDecoder.raw_decode once its text is
+complete. Only the unparsed tail of the text is buffered.
+"""
+
+import json
+import re
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+_AFTER_ITEM = frozenset(" \t\n\r,]")
+
+# Parser states: what the next non-whitespace character must be
+_START, _FIRST_ITEM, _ITEM, _SEPARATOR, _DONE = range(5)
+
+
+class JsonArrayParser:
+    """Incremental parser for one top-level JSON array: feed() text, get back completed items."""
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._state = _START
+
+    @property
+    def finished(self):
+        """True once the closing bracket has been read."""
+        return self._state == _DONE
+
+    def feed(self, chunk, final=False):
+        """
+        Add a chunk of text and return the items it completed. Pass final=True
+        with the last chunk; a truncated or malformed array then raises
+        ValueError.
+        """
+        buffer = self._buffer = self._buffer[self._pos:] + chunk
+        pos, items = 0, []
+        while self._state != _DONE:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+            if self._state == _START:
+                if char != "[":
+                    raise ValueError(f"Expected a JSON array, got {char!r}")
+                self._state, pos = _FIRST_ITEM, pos + 1
+            elif self._state == _SEPARATOR:
+                if char not in ",]":
+                    raise ValueError(f"Expected ',' or ']' in JSON array, got {char!r}")
+                self._state, pos = (_ITEM if char == "," else _DONE), pos + 1
+            elif char == "]" and self._state == _FIRST_ITEM:
+                self._state, pos = _DONE, pos + 1
+            else:
+                try:
+                    item, end = _decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    break  # the item isn't complete yet
+                if end == len(buffer) or buffer[end] not in _AFTER_ITEM:
+                    # A number cut by the chunk boundary ("2." or "12" of "12.5e3") decodes
+                    # short: wait until the item is followed by a separator
+                    if final:
+                        raise ValueError(f"Malformed item in JSON array at {pos}")
+                    break
+                items.append(item)
+                self._state, pos = _SEPARATOR, end
+        self._pos = pos
+        if final and self._state != _DONE:
+            raise ValueError("Truncated JSON array")
+        return items
+
+
+def iter_json_array(chunks):
+    """Yield the items of a JSON array read from an iterable of text chunks."""
+    parser = JsonArrayParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+        if parser.finished:
+            return
+    yield from parser.feed("", final=True)
+
+
+async def aiter_json_array(chunks):
+    """Async counterpart of iter_json_array, for e.g. httpx Response.aiter_text()."""
+    parser = JsonArrayParser()
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+        if parser.finished:
+            return
+    for item in parser.feed("", final=True):
+        yield item
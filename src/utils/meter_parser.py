@@ -12,6 +12,9 @@ Examples:
 
 import re
 from collections import defaultdict
+from functools import lru_cache
+
+from utils.records import ParsedMeter
 
 # --- Normalization Maps ---
 
@@ -66,19 +69,131 @@ SPECIAL_METERS = {
 }
 
 
+_SPECIAL_PREFIXES = tuple(SPECIAL_METERS)
+
+# Meter name prefixes routed to a dedicated parser before the product-based dispatch
+_EDGE_CASE_PREFIXES = (
+    "az-", "image-dall", "sora", "embedding-ada", "text-embedding", "text embedding",
+    "gpt-oss", "oss-", "computer-use",
+)
+
+# Max number of distinct (meter, sku, product) triples kept by parse_meter's memo
+PARSE_CACHE_SIZE = 4096
+
+# Identifies the parsing rules that produced a result, so persisted results
+# (see utils/meter_taxonomy.py) from an older parser are never reused.
+# Bump it whenever a change alters parse_meter's output for any meter.
+PARSER_VERSION = "1"
+
+# Results loaded from a persisted taxonomy, consulted before parsing
+_seeded = {}
+
+
 def parse_meter(meter_name, sku_name="", product_name=""):
     """
     Parse a raw Azure meter name into structured pricing components.
 
+    Results are memoized per (meter_name, sku_name, product_name), so each
+    distinct meter is parsed once per process. The returned ParsedMeter is
+    shared between callers and therefore read-only; read fields as attributes
+    (parsed.group_key) or keys (parsed["group_key"]), and merge it into your
+    own dict (item.update(parsed), {**item, **parsed}) or copy it with dict(parsed).
+
     Args:
         meter_name: The meterName field from Azure Pricing API
         sku_name: The skuName field (sometimes cleaner)
         product_name: The productName field (hints at model family)
 
-    Returns dict with keys:
+    Returns a ParsedMeter (read-only mapping) with fields:
         model, variant, version, capability, deployment, tier, direction,
         media_type, display_name, group_key
     """
+    seeded = _seeded.get((meter_name, sku_name, product_name))
+    if seeded is not None:
+        return seeded
+    return _parse_meter_cached(meter_name, sku_name, product_name)
+
+
+def seed_parsed_meters(parsed_by_triple):
+    """
+    Pre-populate parse_meter with known results, e.g. loaded from a taxonomy file.
+
+    Args:
+        parsed_by_triple: {(meter_name, sku_name, product_name): {field: value}}
+            produced by this PARSER_VERSION
+    """
+    # Convert everything first, so a bad entry leaves nothing half-seeded
+    _seeded.update({triple: ParsedMeter.from_dict(fields) for triple, fields in parsed_by_triple.items()})
+
+
+def is_seeded(meter_name, sku_name="", product_name=""):
+    """True if parse_meter will answer this triple from seeded results."""
+    return (meter_name, sku_name, product_name) in _seeded
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_meter_cached(meter_name, sku_name, product_name):
+    return ParsedMeter(**_parse_meter(meter_name, sku_name, product_name))
+
+
+PARSED_FIELDS = ParsedMeter._fields
+
+
+def _parse_unique(triples):
+    """Parse each distinct (meter, sku, product) triple once.
+
+    Returns (parsed, inverse): parsed[j] is the result for the j-th distinct
+    triple and inverse[i] is the index into parsed for the i-th input row.
+    """
+    index_of = {}
+    parsed = []
+    inverse = []
+    for triple in triples:
+        j = index_of.get(triple)
+        if j is None:
+            j = index_of[triple] = len(parsed)
+            parsed.append(parse_meter(*triple))
+        inverse.append(j)
+    return parsed, inverse
+
+
+def parse_meters_batch(triples):
+    """
+    Parse a column of (meter_name, sku_name, product_name) triples in one call.
+
+    Duplicate triples are parsed once, so cost scales with the number of
+    distinct meters rather than the number of rows.
+
+    Returns columnar results aligned to the input order:
+        {"model": [...], "variant": [...], ..., "group_key": [...]}
+    (one list per PARSED_FIELDS entry; pandas.DataFrame(result) gives a frame).
+    """
+    parsed, inverse = _parse_unique(triples)
+    columns = {}
+    for field in PARSED_FIELDS:
+        values = [getattr(p, field) for p in parsed]
+        columns[field] = [values[j] for j in inverse]
+    return columns
+
+
+def enrich_items(items):
+    """
+    Return copies of pricing items ('Meter', 'Product', optional 'SkuName')
+    merged with their parsed meter fields, parsing each distinct meter once.
+    """
+    parsed, inverse = _parse_unique(
+        (item["Meter"], item.get("SkuName", ""), item["Product"]) for item in items
+    )
+    return [{**item, **parsed[j]} for item, j in zip(items, inverse)]
+
+
+def parse_meter_cache_info():
+    """Hit/miss statistics of the parse_meter memo (functools CacheInfo)."""
+    return _parse_meter_cached.cache_info()
+
+
+def _parse_meter(meter_name, sku_name="", product_name=""):
+    """Uncached parse_meter implementation; returns a fresh dict of the ParsedMeter fields."""
     result = {
         "model": "", "variant": "", "version": "", "capability": "",
         "deployment": "", "tier": "Standard", "direction": "",
@@ -92,30 +207,32 @@ def parse_meter(meter_name, sku_name="", product_name=""):
 
     # Check for special/infrastructure meters
     lower = original.lower()
-    for prefix, name in SPECIAL_METERS.items():
-        if lower.startswith(prefix):
-            result["model"] = name
-            # Extract deployment
-            for tok, deploy in DEPLOYMENT_TOKENS.items():
-                if tok in lower:
-                    result["deployment"] = deploy
-                    break
-            result["display_name"] = result["group_key"] = name
-            return result
+    if lower.startswith(_SPECIAL_PREFIXES):
+        for prefix, name in SPECIAL_METERS.items():
+            if lower.startswith(prefix):
+                result["model"] = name
+                # Extract deployment
+                for tok, deploy in DEPLOYMENT_TOKENS.items():
+                    if tok in lower:
+                        result["deployment"] = deploy
+                        break
+                result["display_name"] = result["group_key"] = name
+                return result
 
     # Handle specific edge cases
-    if lower.startswith("az-"):
-        return _parse_legacy_az(original, result)
-    if lower.startswith("image-dall"):
-        return _parse_dalle(original, result)
-    if lower.startswith("sora"):
-        return _parse_sora(original, result)
-    if lower.startswith("embedding-ada") or lower.startswith("text-embedding") or lower.startswith("text embedding"):
-        return _parse_embedding(original, result)
-    if lower.startswith("gpt-oss") or lower.startswith("oss-"):
-        return _parse_oss(original, result)
-    if lower.startswith("computer-use"):
-        return _parse_simple_model(original, "Computer Use", result)
+    if lower.startswith(_EDGE_CASE_PREFIXES):
+        if lower.startswith("az-"):
+            return _parse_legacy_az(original, result)
+        if lower.startswith("image-dall"):
+            return _parse_dalle(original, result)
+        if lower.startswith("sora"):
+            return _parse_sora(original, result)
+        if lower.startswith(("embedding-ada", "text-embedding", "text embedding")):
+            return _parse_embedding(original, result)
+        if lower.startswith(("gpt-oss", "oss-")):
+            return _parse_oss(original, result)
+        if lower.startswith("computer-use"):
+            return _parse_simple_model(original, "Computer Use", result)
 
     # Main parsing: determine model family from product_name hint
     product_lower = product_name.lower() if product_name else ""
@@ -139,153 +256,177 @@ def parse_meter(meter_name, sku_name="", product_name=""):
 
 def _tokenize(text):
     """Split meter name into normalized tokens, stripping unit suffixes."""
-    # Replace hyphens with spaces for splitting, but preserve key patterns
-    # First handle known hyphenated model names
-    normalized = text
+    return list(_tokenize_cached(text))
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _tokenize_cached(text):
+    # Several _parse_* paths re-tokenize the same meter name, so tokenize each name once
+    tokens = text.split()
+    # Remove unit suffix tokens ("1M", "1K", "Tokens", ...) from anywhere
+    return tuple(t for t in tokens if t.lower() not in UNIT_SUFFIXES)
+
+
+# --- Compiled attribute lexer ---
+#
+# _extract_attributes looks each raw token up once in _TOKEN_PLANS, which maps
+# it to the two-token phrase it may start (see _PAIR_RULES) and an ordered
+# tuple of (kind, field, value) actions, tried until one applies. _SET always
+# applies; _SET_IF_UNSET only while its field is empty, otherwise the next
+# action is tried. A token no action accepts is left over. Plans are built on
+# first sight of a token, so lowercasing, suffix stripping and pattern matching
+# happen once per distinct token rather than once per meter.
+
+(_SET, _SET_IF_UNSET, _CACHED, _FINE_TUNING, _CAPABILITY_VERSION, _MEDIA, _IGNORE) = range(7)
+
+_VERSION_RE = re.compile(r'^(?:\d+\.\d+|\d{4})$')
+_CAPABILITY_VERSION_RE = re.compile(r'^(aud|txt|img)(\d{4})$')
+
+# Patterns used by the product-specific parsers
+_GPT5_VERSION_RE = re.compile(r'^5(\.\d+)?$')
+_GPT_HYPHEN_VERSION_RE = re.compile(r'gpt-(\d+\.?\d*)')
+_GPT4_5_RE = re.compile(r'^[45]\w*')
+_DIGITS_RE = re.compile(r'^\d+$')
+_NUMERIC_VERSION_RE = re.compile(r'^\d+\.?\d*$')
+_LEADING_DIGIT_RE = re.compile(r'^\d')
+_O_SERIES_RE = re.compile(r'^o\d')
+
+# first token -> (accepted second tokens, rule)
+_PAIR_RULES = {
+    "data": (("zone", "zone,"), "data zone"),
+    "high": (("res",), "high res"),
+    "model": (("grader", "grdr"), "grader"),
+    "mdl": (("grader", "grdr"), "grader"),
+    "mdel": (("grader", "grdr"), "grader"),
+    "deep": (("research",), "deep research"),
+    "dev": (("ft", "rft"), "dev tier"),
+    # "d" before a media token ("tcrb d aud") is dropped; the media token is handled next
+    "d": (tuple(MEDIA_TOKENS), "skip d"),
+}
 
-    # Strip trailing unit tokens
-    tokens = normalized.split()
-    # Remove unit suffix tokens from end
-    while tokens and tokens[-1].lower() in UNIT_SUFFIXES:
-        tokens.pop()
-    # Also remove "1M", "1K" etc from anywhere
-    tokens = [t for t in tokens if t.lower() not in UNIT_SUFFIXES]
-    return tokens
+
+def _build_token_actions():
+    """Precompute the action table, in the same priority order as the rules it encodes."""
+    actions = defaultdict(list)
+    for tok in CACHED_TOKENS:
+        actions[tok].append((_CACHED, None, None))
+    for tok, value in DEPLOYMENT_TOKENS.items():
+        actions[tok].append((_SET_IF_UNSET, "deployment", value))
+    for tok, value in TIER_TOKENS.items():
+        actions[tok].append((_SET, "tier", value))
+    actions["ft"].append((_FINE_TUNING, None, None))       # only upgrades the Standard tier
+    actions["rft"].append((_SET, "tier", "RFT"))
+    for tok, value in DIRECTION_TOKENS.items():
+        actions[tok].append((_SET, "direction", value))
+    for tok, value in VARIANT_TOKENS.items():
+        actions[tok].append((_SET_IF_UNSET, "variant", value))
+    for tok, value in CAPABILITY_TOKENS.items():
+        actions[tok].append((_SET_IF_UNSET, "capability", value))
+    for tok, value in MEDIA_TOKENS.items():
+        # media_type if unset; doubles as capability when that is still empty
+        actions[tok].append((_MEDIA, None, (value, CAPABILITY_TOKENS.get(tok))))
+    actions["prvw"].append((_IGNORE, None, None))
+    return {tok: tuple(acts) for tok, acts in actions.items()}
+
+
+_TOKEN_ACTIONS = _build_token_actions()
+
+
+def _pattern_actions(tok):
+    """Actions for tokens outside the static table: versions and capability+version combos."""
+    if _VERSION_RE.match(tok):
+        return ((_SET_IF_UNSET, "version", tok),)
+    cap_ver = _CAPABILITY_VERSION_RE.match(tok)
+    if cap_ver:
+        capability = CAPABILITY_TOKENS.get(cap_ver.group(1), cap_ver.group(1))
+        return ((_CAPABILITY_VERSION, None, (capability, cap_ver.group(2))),)
+    return ()
+
+
+# raw token -> (pair rule or None, actions); at most PARSE_CACHE_SIZE entries
+_TOKEN_PLANS = {}
+
+
+def _token_plan(raw):
+    """Look up (or build and remember) the lexer plan for one raw token."""
+    plan = _TOKEN_PLANS.get(raw)
+    if plan is None:
+        tok = raw.lower().rstrip("-")
+        actions = _TOKEN_ACTIONS.get(tok)
+        if actions is None:
+            actions = _pattern_actions(tok)
+        plan = (_PAIR_RULES.get(tok), actions)
+        if len(_TOKEN_PLANS) < PARSE_CACHE_SIZE:
+            _TOKEN_PLANS[raw] = plan
+    return plan
 
 
 def _extract_attributes(tokens, result):
     """Extract deployment, tier, direction, cached, variant, version, capability from tokens."""
     remaining = []
+    cached = False
+    plans = _TOKEN_PLANS
+    n = len(tokens)
     i = 0
-    while i < len(tokens):
-        tok = tokens[i].lower().rstrip("-")
-
-        # Multi-token: "Data Zone"
-        if tok == "data" and i + 1 < len(tokens) and tokens[i + 1].lower() in ("zone", "zone,"):
-            result["deployment"] = "DataZone"
+    while i < n:
+        raw = tokens[i]
+        plan = plans.get(raw) or _token_plan(raw)
+        pair, actions = plan
+
+        # Multi-token phrases
+        if pair is not None and i + 1 < n and tokens[i + 1].lower() in pair[0]:
+            rule = pair[1]
+            if rule == "skip d":
+                i += 1
+                continue
+            if rule == "data zone":
+                result["deployment"] = "DataZone"
+            elif rule == "high res":
+                remaining.append("HighRes")
+            elif rule == "grader":
+                result["tier"] = "FT Grader"
+            elif rule == "deep research":
+                result["capability"] = "Deep Research"
+            elif rule == "dev tier":
+                result["tier"] = f"Dev {tokens[i + 1].upper()}"
             i += 2
             continue
 
-        # Multi-token: "high res"
-        if tok == "high" and i + 1 < len(tokens) and tokens[i + 1].lower() == "res":
-            remaining.append("HighRes")
-            i += 2
-            continue
-
-        # Multi-token: model ft grader / mdl grdr
-        if tok in ("model", "mdl", "mdel") and i + 1 < len(tokens) and tokens[i + 1].lower() in ("grader", "grdr"):
-            result["tier"] = "FT Grader"
-            i += 2
-            continue
-
-        # Multi-token: "deep research"
-        if tok == "deep" and i + 1 < len(tokens) and tokens[i + 1].lower() == "research":
-            result["capability"] = "Deep Research"
-            i += 2
-            continue
-
-        # Cached tokens (look-ahead: next token is direction)
-        if tok in CACHED_TOKENS:
-            # Mark as cached, direction will be set later
-            result["_cached"] = True
-            i += 1
-            continue
-
-        # Deployment
-        if tok in DEPLOYMENT_TOKENS and not result["deployment"]:
-            result["deployment"] = DEPLOYMENT_TOKENS[tok]
-            i += 1
-            continue
-
-        # Tier
-        if tok in TIER_TOKENS:
-            result["tier"] = TIER_TOKENS[tok]
-            i += 1
-            continue
-
-        # Fine-tuning indicators
-        if tok in ("ft", "ft-"):
-            if result["tier"] == "Standard":
-                result["tier"] = "Fine-tuning"
-            i += 1
-            continue
-
-        if tok == "rft":
-            result["tier"] = "RFT"
-            i += 1
-            continue
-
-        if tok == "dev" and i + 1 < len(tokens) and tokens[i + 1].lower() in ("ft", "rft"):
-            result["tier"] = f"Dev {tokens[i + 1].upper()}"
-            i += 2
-            continue
-
-        # Direction
-        if tok in DIRECTION_TOKENS:
-            result["direction"] = DIRECTION_TOKENS[tok]
-            i += 1
-            continue
-
-        # Variant
-        if tok in VARIANT_TOKENS and not result["variant"]:
-            result["variant"] = VARIANT_TOKENS[tok]
-            i += 1
-            continue
-
-        # Version (4-digit date codes or decimal versions like 1.5)
-        if re.match(r'^\d+\.\d+$', tok) and not result["version"]:
-            result["version"] = tok
-            i += 1
-            continue
-        if re.match(r'^\d{4}$', tok) and not result["version"]:
-            result["version"] = tok
-            i += 1
-            continue
-
-        # Capability (including combined tokens like "aud1217", "txt1217")
-        if tok in CAPABILITY_TOKENS and not result["capability"]:
-            result["capability"] = CAPABILITY_TOKENS[tok]
-            i += 1
-            continue
-        # Combined capability+version: "aud1217", "txt1217"
-        cap_ver = re.match(r'^(aud|txt|img)(\d{4})$', tok)
-        if cap_ver and not result["capability"]:
-            result["capability"] = CAPABILITY_TOKENS.get(cap_ver.group(1), cap_ver.group(1))
-            if not result["version"]:
-                result["version"] = cap_ver.group(2)
-            i += 1
-            continue
-
-        # Media type
-        if tok in MEDIA_TOKENS and not result.get("media_type"):
-            # If capability not set and this is a media-type-as-capability token, set capability
-            if not result.get("capability") and tok in CAPABILITY_TOKENS:
-                result["capability"] = CAPABILITY_TOKENS[tok]
-            else:
-                result["media_type"] = MEDIA_TOKENS[tok]
-            i += 1
-            continue
-
-        # "d" prefix in media context (e.g., "tcrb d aud" = transcribe audio)
-        if tok == "d" and i + 1 < len(tokens) and tokens[i + 1].lower() in MEDIA_TOKENS:
-            # skip "d", next iteration handles media type
-            i += 1
-            continue
-
-        # "prvw" = preview (modifier, not standalone)
-        if tok == "prvw":
-            i += 1
-            continue
-
-        remaining.append(tokens[i])
+        for kind, field, value in actions:
+            if kind == _SET:
+                result[field] = value
+            elif kind == _SET_IF_UNSET:
+                if result[field]:
+                    continue
+                result[field] = value
+            elif kind == _CACHED:
+                # Direction comes later; applied after the loop
+                cached = True
+            elif kind == _FINE_TUNING:
+                if result["tier"] == "Standard":
+                    result["tier"] = "Fine-tuning"
+            elif kind == _CAPABILITY_VERSION:
+                if result["capability"]:
+                    continue
+                result["capability"], version = value
+                if not result["version"]:
+                    result["version"] = version
+            elif kind == _MEDIA:
+                if result["media_type"]:
+                    continue
+                media_type, capability = value
+                if not result["capability"] and capability:
+                    result["capability"] = capability
+                else:
+                    result["media_type"] = media_type
+            break
+        else:
+            remaining.append(raw)
         i += 1
 
     # Apply cached flag
-    if result.pop("_cached", False):
-        if result["direction"] == "Input" or not result["direction"]:
-            result["direction"] = "Cached Input"
-        elif result["direction"] == "":
-            result["direction"] = "Cached Input"
+    if cached and (result["direction"] == "Input" or not result["direction"]):
+        result["direction"] = "Cached Input"
 
     return remaining
 
@@ -342,7 +483,7 @@ def _parse_gpt5_product(original, result):
     # Handle "GPT" prefix: "GPT 5", "GPT 5.1", etc.
     if tok0 == "gpt" and len(tokens) > 1:
         version_tok = tokens[1]
-        if re.match(r'^5(\.\d+)?$', version_tok):
+        if _GPT5_VERSION_RE.match(version_tok):
             result["model"] = f"GPT-{version_tok}"
             tokens = tokens[2:]
         else:
@@ -350,7 +491,7 @@ def _parse_gpt5_product(original, result):
             tokens = tokens[1:]
     # Handle "gpt-5-codex" style
     elif tok0.startswith("gpt-5"):
-        m = re.match(r'gpt-(\d+\.?\d*)', tok0)
+        m = _GPT_HYPHEN_VERSION_RE.match(tok0)
         if m:
             result["model"] = f"GPT-{m.group(1)}"
             # Check for codex etc in remaining hyphenated parts
@@ -365,14 +506,14 @@ def _parse_gpt5_product(original, result):
             tokens = tokens[1:]
     # Handle "gpt 5 ..." style
     elif tok0 == "gpt" or tok0.startswith("gpt"):
-        if len(tokens) > 1 and re.match(r'^5(\.\d+)?$', tokens[1]):
+        if len(tokens) > 1 and _GPT5_VERSION_RE.match(tokens[1]):
             result["model"] = f"GPT-{tokens[1]}"
             tokens = tokens[2:]
         else:
             result["model"] = "GPT-5"
             tokens = tokens[1:]
     # Bare version: "5.1 codex ..."
-    elif re.match(r'^5(\.\d+)?$', tok0):
+    elif _GPT5_VERSION_RE.match(tok0):
         result["model"] = f"GPT-{tok0}"
         tokens = tokens[1:]
     else:
@@ -393,13 +534,13 @@ def _parse_pp_gpt4(original, result):
     if tok0 == "gpt" and len(tokens) > 1:
         # "gpt 41 mn pp ..." -> GPT-4.1
         version_str = tokens[1]
-        if re.match(r'^\d+$', version_str) and len(version_str) == 2:
+        if _DIGITS_RE.match(version_str) and len(version_str) == 2:
             # "41" -> "4.1"
             result["model"] = f"GPT-{version_str[0]}.{version_str[1]}"
         else:
             result["model"] = f"GPT-{version_str}"
         tokens = tokens[2:]
-    elif re.match(r'^\d+\.?\d*$', tok0):
+    elif _NUMERIC_VERSION_RE.match(tok0):
         result["model"] = f"GPT-{tok0}"
         tokens = tokens[1:]
     else:
@@ -416,7 +557,7 @@ def _parse_reasoning(original, result):
     tok0 = tokens[0].lower() if tokens else ""
 
     # Handle hyphenated o-series: o1-pro, o3-pro, o4-mini, o3-ft, o3-mini-ft, o3-deep
-    if tok0.startswith("o") and re.match(r'^o\d', tok0):
+    if tok0.startswith("o") and _O_SERIES_RE.match(tok0):
         # Split on hyphens
         parts = tokens[0].split("-")
         result["model"] = parts[0]  # o1, o3, o4
@@ -486,7 +627,7 @@ def _parse_media(original, result):
     if tok0 == "gpt":
         tokens = tokens[1:]
         # Check if next token is model version like "4o"
-        if tokens and re.match(r'^\d', tokens[0].lower()):
+        if tokens and _LEADING_DIGIT_RE.match(tokens[0].lower()):
             result["model"] = f"GPT-{tokens[0]}"
             tokens = tokens[1:]
         else:
@@ -527,14 +668,14 @@ def _parse_main_openai(original, result):
         return _parse_hyphenated_gpt(original, result)
 
     # o-series: o1, o3, o4-mini
-    if re.match(r'^o\d', first_lower):
+    if _O_SERIES_RE.match(first_lower):
         return _parse_reasoning(original, result)
 
     # "gpt 4.1 mini ...", "gpt 4o 0513 ..."
     if first_lower == "gpt" and len(tokens_raw) > 1:
         next_tok = tokens_raw[1].lower()
         # "gpt 4.1", "gpt 4o"
-        if re.match(r'^4', next_tok) or re.match(r'^\d', next_tok):
+        if _LEADING_DIGIT_RE.match(next_tok):
             model_str = tokens_raw[1]
             # Normalize: "4.1" stays, "4o" stays
             result["model"] = f"GPT-{model_str}"
@@ -596,7 +737,7 @@ def _parse_hyphenated_gpt(original, result):
             result["model"] = f"GPT-4-{ctx}"
             model_parts_consumed = 3
         # gpt-4o, gpt-4.1, gpt-5
-        elif re.match(r'^[45]\w*', model_id):
+        elif _GPT4_5_RE.match(model_id):
             result["model"] = f"GPT-{model_id}"
             model_parts_consumed = 2
             # Check for variant: gpt-4o-mini, gpt-4.1-mini, gpt-4.1-nano
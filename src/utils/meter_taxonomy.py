@@ -0,0 +1,84 @@
+"""
+Meter Taxonomy Artifact
+
+A compact file written by the pricing monitor next to pricing_current.json.
+It maps every distinct (meter, sku, product) triple in the snapshot to its
+parsed fields (group_key, deployment, tier, direction, ...) and is stamped
+with the PARSER_VERSION that produced them.
+
+Readers call load_taxonomy() once; parse_meter then answers those meters from
+the file, and only meters that are new (or a file from an older parser
+version) are parsed at runtime.
+
+File format:
+    {
+        "parser_version": "...",
+        "fields": ["model", "variant", ...],
+        "meters": [[meter, sku, product, [value per field]], ...]
+    }
+"""
+
+import json
+import os
+
+from utils.meter_parser import PARSED_FIELDS, PARSER_VERSION, is_seeded, parse_meter, seed_parsed_meters
+
+TAXONOMY_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "data", "meter_taxonomy.json")
+
+
+def load_taxonomy(path=TAXONOMY_PATH):
+    """
+    Seed parse_meter from a taxonomy file.
+
+    Returns the number of meters loaded; 0 if the file is missing, unreadable,
+    malformed, or was produced by a different parser version.
+    """
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return 0
+    try:
+        if data.get("parser_version") != PARSER_VERSION:
+            return 0
+        fields = data["fields"]
+        parsed = {
+            (meter, sku, product): dict(zip(fields, values))
+            for meter, sku, product, values in data["meters"]
+        }
+        seed_parsed_meters(parsed)
+    except (AttributeError, KeyError, TypeError, ValueError):
+        # Runs at server import time: a bad file must not stop startup
+        return 0
+    return len(parsed)
+
+
+def save_taxonomy(prices, path=TAXONOMY_PATH):
+    """
+    Write the taxonomy for every distinct meter in a {region: [items]} snapshot.
+
+    Returns (total, newly_parsed): the number of meters written and how many of
+    them were not already known from a loaded taxonomy.
+    """
+    triples = sorted({
+        (item["Meter"], item.get("SkuName", ""), item["Product"])
+        for items in prices.values()
+        for item in items
+    })
+    newly_parsed = sum(1 for triple in triples if not is_seeded(*triple))
+
+    # One meter per line keeps the weekly git diff readable
+    lines = []
+    for meter, sku, product in triples:
+        parsed = parse_meter(meter, sku, product)
+        lines.append(json.dumps([meter, sku, product, [parsed[f] for f in PARSED_FIELDS]]))
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write("{\n")
+        f.write(f'"parser_version": {json.dumps(PARSER_VERSION)},\n')
+        f.write(f'"fields": {json.dumps(list(PARSED_FIELDS))},\n')
+        f.write('"meters": [\n')
+        f.write(",\n".join(lines))
+        f.write("\n]\n}\n")
+    return len(triples), newly_parsed
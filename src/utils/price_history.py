@@ -0,0 +1,355 @@
+"""
+Pricing History Store
+
+An append-only SQLite database of every price the monitor has seen. Each
+recorded snapshot adds only the rows that changed since the previous one:
+
+  - the first snapshot is stored in full (change_type "baseline")
+  - after that: "increased" / "decreased" / "new" / "removed" rows, with
+    change_pct computed as in the weekly diff, plus "changed" rows for
+    prices that became or stopped being "N/A"
+
+Rows are indexed on (region, meter, observed_at) and on observed_at, so
+point-in-time lookups and "changes since" scans are index range reads.
+
+The database is a local index, not the record: every snapshot is also
+appended to a text change log next to it (data/pricing_history.jsonl),
+which is what the weekly workflow commits. Each snapshot is one header
+line followed by one line per changed row:
+
+    {"observed_at": "2026-03-02T09:00:00+00:00", "row_count": 13345, "change_count": 2}
+    ["eastus", "gpt 4o inp gl", "decreased", 0.002, 0.0025, -20.0, "1K", "Azure OpenAI", ""]
+
+so a week's commit is a small, diffable append. Opening a PriceHistory
+replays log entries the database doesn't have yet (a fresh checkout
+builds the whole database from it), and rebuilds the database if it holds
+snapshots the log doesn't.
+
+Queries (run from project root):
+    python src/utils/price_history.py price eastus "gpt 4o inp gl" 2026-03-01
+    python src/utils/price_history.py changes 90
+"""
+
+import json
+import os
+import sqlite3
+import sys
+from datetime import date, datetime, timedelta, timezone
+
+# Path setup — allow running as a script
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from utils.records import PriceEntry
+
+HISTORY_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "data", "pricing_history.sqlite")
+HISTORY_LOG_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "data", "pricing_history.jsonl")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    observed_at TEXT PRIMARY KEY,
+    row_count INTEGER NOT NULL,
+    change_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS prices (
+    region TEXT NOT NULL,
+    meter TEXT NOT NULL,
+    observed_at TEXT NOT NULL,
+    change_type TEXT NOT NULL,
+    price,              -- new price (NULL when removed); REAL, or 'N/A'
+    old_price,          -- previous price for increased / decreased / removed
+    change_pct REAL,
+    unit TEXT,
+    product TEXT,
+    sku TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_prices_region_meter_time ON prices (region, meter, observed_at);
+CREATE INDEX IF NOT EXISTS idx_prices_time ON prices (observed_at);
+"""
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _classify(old_price, new_price):
+    """(change_type, old_price, change_pct) for a price that changed, as in the weekly diff."""
+    if not (_is_number(old_price) and _is_number(new_price)):
+        # e.g. a price that became, or stopped being, "N/A"
+        return "changed", old_price, None
+    change_pct = ((new_price - old_price) / old_price) * 100 if old_price > 0 else 100.0
+    return ("increased" if new_price > old_price else "decreased"), old_price, round(change_pct, 2)
+
+
+def normalize_timestamp(when):
+    """
+    Normalize a datetime, date or ISO string to the stored UTC timestamp format.
+    Dates (and "YYYY-MM-DD" strings) mean the end of that day.
+    """
+    if isinstance(when, str):
+        when = date.fromisoformat(when) if len(when) == 10 else datetime.fromisoformat(when)
+    if not isinstance(when, datetime):
+        when = datetime.combine(when, datetime.max.time())
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when.astimezone(timezone.utc).isoformat()
+
+
+def price_state(prices):
+    """{(region, meter): (price, unit, product, sku)} for a {region: [items]} snapshot."""
+    state = {}
+    for region, items in prices.items():
+        for item in items:
+            if type(item) is PriceEntry:
+                state[region, item.Meter] = (item.Price, item.Unit, item.Product, item.SkuName)
+            else:
+                state[region, item["Meter"]] = (
+                    item["Price"], item.get("Unit", "N/A"), item.get("Product", ""), item.get("SkuName", "")
+                )
+    return state
+
+
+def state_changes(before, after, observed_at):
+    """
+    Rows to store for a snapshot with state `after` (see price_state), given
+    the latest recorded state `before`, or None if nothing is recorded yet.
+    """
+    observed_at = normalize_timestamp(observed_at)
+    rows = []
+    for (region, meter), (price, unit, product, sku) in after.items():
+        old = before.get((region, meter)) if before is not None else None
+        if old is None:
+            change_type, old_price, change_pct = ("new" if before is not None else "baseline"), None, None
+        elif old[0] == price:
+            continue
+        else:
+            change_type, old_price, change_pct = _classify(old[0], price)
+        rows.append((region, meter, observed_at, change_type, price, old_price, change_pct, unit, product, sku))
+    for (region, meter), (price, unit, product, sku) in (before or {}).items():
+        if (region, meter) not in after:
+            rows.append((region, meter, observed_at, "removed", None, price, None, unit, product, sku))
+    return rows
+
+
+def _log_lines(observed_at, row_count, rows):
+    """Change-log lines for one snapshot (rows as stored, see state_changes)."""
+    yield json.dumps({"observed_at": observed_at, "row_count": row_count, "change_count": len(rows)}) + "\n"
+    for region, meter, _, *values in rows:
+        yield json.dumps([region, meter, *values]) + "\n"
+
+
+def read_log(path):
+    """Yield (observed_at, row_count, rows) for each snapshot in a change log, oldest first."""
+    try:
+        f = open(path, "r", encoding="utf-8")
+    except FileNotFoundError:
+        return
+    with f:
+        snapshot = None
+        for line in f:
+            entry = json.loads(line)
+            if isinstance(entry, dict):
+                if snapshot is not None:
+                    yield snapshot
+                snapshot = (entry["observed_at"], entry["row_count"], [])
+            else:
+                region, meter, *values = entry
+                snapshot[2].append((region, meter, snapshot[0], *values))
+        if snapshot is not None:
+            yield snapshot
+
+
+class PriceHistory:
+    def __init__(self, path=HISTORY_PATH, log_path=None):
+        """
+        Open (or create) the database at `path`, kept in step with the change
+        log at `log_path` (default: `path` with a .jsonl extension).
+        """
+        self.path = path
+        self.log_path = log_path or os.path.splitext(path)[0] + ".jsonl"
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        self._state = None
+        self._sync_with_log()
+
+    def _sync_with_log(self):
+        """Replay log entries missing from the database; rebuild it if it has entries the log lacks."""
+        recorded = self.snapshot_times()
+        logged = set()
+        replay = []
+        for observed_at, row_count, rows in read_log(self.log_path):
+            logged.add(observed_at)
+            if not recorded or observed_at > recorded[-1]:
+                replay.append((observed_at, row_count, rows))
+        if not logged:
+            if recorded:
+                # A database from before the change log existed: it becomes the log
+                self._write_log()
+            return
+        if not logged.issuperset(recorded):
+            with self.conn:
+                self.conn.execute("DELETE FROM prices")
+                self.conn.execute("DELETE FROM snapshots")
+            replay = list(read_log(self.log_path))
+        for observed_at, row_count, rows in replay:
+            self._insert(observed_at, row_count, rows)
+
+    def _write_log(self):
+        """Rewrite the whole change log from the database."""
+        tmp_path = f"{self.log_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for observed_at, row_count, _ in self.conn.execute("SELECT * FROM snapshots ORDER BY observed_at"):
+                rows = self.conn.execute(
+                    "SELECT * FROM prices WHERE observed_at = ? ORDER BY region, meter", (observed_at,)
+                ).fetchall()
+                f.writelines(_log_lines(observed_at, row_count, [tuple(row) for row in rows]))
+        os.replace(tmp_path, self.log_path)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def latest_snapshot(self):
+        """Timestamp of the most recently recorded snapshot, or None."""
+        return self.conn.execute("SELECT MAX(observed_at) FROM snapshots").fetchone()[0]
+
+    def snapshot_times(self):
+        """Timestamps of every recorded snapshot, oldest first."""
+        return [row[0] for row in self.conn.execute("SELECT observed_at FROM snapshots ORDER BY observed_at")]
+
+    def _state_at(self, observed_at=None):
+        """{(region, meter): (price, unit, product, sku)} for every meter listed as of observed_at (default: latest)."""
+        rows = self.conn.execute("""
+            SELECT p.region, p.meter, p.price, p.unit, p.product, p.sku
+            FROM prices p
+            JOIN (
+                SELECT region, meter, MAX(observed_at) AS observed_at
+                FROM prices WHERE ? IS NULL OR observed_at <= ? GROUP BY region, meter
+            ) latest USING (region, meter, observed_at)
+            WHERE p.change_type != 'removed'
+            ORDER BY p.region, p.meter
+        """, (observed_at, observed_at))
+        return {(r, m): (price, unit, product, sku) for r, m, price, unit, product, sku in rows}
+
+    def _latest_state(self):
+        """_state_at() for the latest snapshot, loaded once."""
+        if self._state is None:
+            self._state = self._state_at()
+        return self._state
+
+    @staticmethod
+    def _as_prices(state):
+        prices = {}
+        for (region, meter), (price, unit, product, sku) in sorted(state.items()):
+            prices.setdefault(region, []).append(PriceEntry(meter, price, unit, product, sku))
+        return prices
+
+    def current_prices(self):
+        """The latest recorded {region: [PriceEntry]} state, sorted by meter."""
+        return self._as_prices(self._latest_state())
+
+    def prices_at(self, when):
+        """The {region: [PriceEntry]} state as of `when` (datetime, date or ISO string), sorted by meter."""
+        return self._as_prices(self._state_at(normalize_timestamp(when)))
+
+    def replace_with(self, other):
+        """Replace everything recorded here with the contents of another PriceHistory (e.g. a rebuilt one)."""
+        with self.conn:
+            self.conn.execute("DELETE FROM prices")
+            self.conn.execute("DELETE FROM snapshots")
+            self.conn.executemany("INSERT INTO snapshots VALUES (?, ?, ?)",
+                                  other.conn.execute("SELECT * FROM snapshots ORDER BY observed_at"))
+            self.conn.executemany("INSERT INTO prices VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                  other.conn.execute("SELECT * FROM prices ORDER BY observed_at, region, meter"))
+        self._state = None
+        self._write_log()
+
+    def record_snapshot(self, observed_at, prices):
+        """
+        Append a {region: [items]} snapshot taken at observed_at, storing only
+        rows that differ from the latest recorded state.
+
+        Returns the number of rows written, or None if a snapshot with this
+        timestamp is already recorded. Snapshots must be recorded in time order.
+        """
+        observed_at = normalize_timestamp(observed_at)
+        latest = self.latest_snapshot()
+        if latest == observed_at:
+            return None
+        if latest is not None and observed_at < latest:
+            raise ValueError(f"Snapshot {observed_at} is older than the latest recorded one ({latest})")
+
+        after = price_state(prices)
+        rows = state_changes(self._latest_state() if latest else None, after, observed_at)
+        self.record_changes(observed_at, sum(len(items) for items in prices.values()), rows)
+        self._state = after
+        return len(rows)
+
+    def record_changes(self, observed_at, row_count, rows):
+        """
+        Append a snapshot whose rows were already computed by state_changes()
+        against the latest recorded state (the backfill diffs snapshots in
+        worker processes). record_snapshot() is the usual entry point.
+        """
+        observed_at = normalize_timestamp(observed_at)
+        # The log first: a snapshot in the log but not the database is replayed on the next open
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.writelines(_log_lines(observed_at, row_count, rows))
+        self._insert(observed_at, row_count, rows)
+
+    def _insert(self, observed_at, row_count, rows):
+        with self.conn:
+            self.conn.executemany("INSERT INTO prices VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self.conn.execute("INSERT INTO snapshots VALUES (?, ?, ?)", (observed_at, row_count, len(rows)))
+        self._state = None
+
+    def price_at(self, region, meter, when):
+        """
+        Price of a meter in a region as of `when` (datetime, date or ISO string).
+        Returns None if the meter wasn't listed there at that time.
+        """
+        row = self.conn.execute("""
+            SELECT price, change_type FROM prices
+            WHERE region = ? AND meter = ? AND observed_at <= ?
+            ORDER BY observed_at DESC LIMIT 1
+        """, (region, meter, normalize_timestamp(when))).fetchone()
+        if row is None or row["change_type"] == "removed":
+            return None
+        return row["price"]
+
+    def changes_since(self, since):
+        """All recorded changes (not the baseline) at or after `since`, oldest first, as dicts."""
+        rows = self.conn.execute("""
+            SELECT observed_at, region, meter, product, change_type, old_price, price AS new_price, change_pct
+            FROM prices
+            WHERE observed_at >= ? AND change_type != 'baseline'
+            ORDER BY observed_at, region, meter
+        """, (normalize_timestamp(since),))
+        return [dict(row) for row in rows]
+
+    def recent_changes(self, days=90):
+        """Changes recorded in the last `days` days."""
+        return self.changes_since(datetime.now(timezone.utc) - timedelta(days=days))
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if not ((len(args) in (3, 4) and args[0] == "price") or (len(args) in (1, 2) and args[0] == "changes")):
+        print("Usage: python src/utils/price_history.py price <region> <meter> [date]")
+        print("       python src/utils/price_history.py changes [days]")
+        sys.exit(1)
+
+    with PriceHistory() as history:
+        if args[0] == "price":
+            when = args[3] if len(args) == 4 else datetime.now(timezone.utc)
+            print(history.price_at(args[1], args[2], when))
+        else:
+            for c in history.recent_changes(int(args[1]) if len(args) == 2 else 90):
+                print(f"{c['observed_at'][:10]}  {c['region']:20s} {c['change_type']:9s} "
+                      f"{c['old_price']} -> {c['new_price']}  {c['meter']}")
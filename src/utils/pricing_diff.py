@@ -0,0 +1,295 @@
+"""
+Vectorized Pricing Diff
+
+Compares two pricing snapshots with a single outer join on (region, meter)
+instead of per-region dict lookups:
+
+  1. Every row gets an int64 (region, meter) key (regions ranked by name,
+     meter names factorized over both snapshots) and its position within
+     its region.
+  2. Duplicate meters within a region collapse to one entry that keeps the
+     first occurrence's position and the last occurrence's price, matching
+     a {item["Meter"]: item} lookup.
+  3. Previous and current keys are joined through hash indexes; increased /
+     decreased / new / removed and change_pct are computed with array
+     operations.
+  4. Only the changed rows are turned into change dicts and parsed
+     (parse_meters_batch) for their group_key, deployment, tier, ...
+
+Snapshots can be {region: [items]} (PriceEntry records or dicts) or
+SnapshotColumns from utils.snapshot_store, which skips per-row Python work
+entirely until the changed rows are materialized.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.meter_parser import parse_meter, parse_meters_batch
+from utils.records import price_entries
+from utils.snapshot_store import PRICE_INT, PRICE_NA, SnapshotColumns
+
+# Parsed meter fields attached to every change, used for grouping in the email
+CHANGE_FIELDS = ("group_key", "deployment", "tier", "direction", "display_name")
+
+
+class _RecordSide:
+    """Rows of a {region: [items]} snapshot, addressed by their flat index."""
+
+    def __init__(self, prices):
+        self.regions = list(prices)
+        self.items = []
+        for items in prices.values():
+            self.items.extend(price_entries(items))
+        self.region_offsets = np.cumsum([0] + [len(items) for items in prices.values()])
+
+        raw = [item.Price for item in self.items]
+        self.price = np.array([np.nan if p == "N/A" else p for p in raw], dtype=np.float64)
+        self.na = np.array([p == "N/A" for p in raw], dtype=bool)
+        # Every row is its own entry in the meter vocabulary
+        self.meter_vocab = np.array([item.Meter for item in self.items], dtype=object)
+        self.meter_codes = np.arange(len(self.items), dtype=np.int64)
+
+    def price_value(self, row):
+        return self.items[row].Price
+
+    def meter_names(self, rows):
+        return [self.items[row].Meter for row in rows.tolist()]
+
+    def meter_info(self, row):
+        item = self.items[row]
+        return item.Meter, item.SkuName, item.Product
+
+
+class _ColumnSide:
+    """Rows of a SnapshotColumns snapshot, addressed by their flat index."""
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.regions = columns.regions
+        self.region_offsets = columns.region_offsets
+        self.price = columns.price
+        self.na = columns.price_kind == PRICE_NA
+        self.meter_vocab = columns.meter_values.astype(object)
+        self.meter_codes = columns.meter_codes
+
+    def meter_names(self, rows):
+        return self.columns.meter_values[self.columns.meter_codes[rows]].tolist()
+
+    def price_value(self, row):
+        c = self.columns
+        if c.price_kind[row] == PRICE_NA:
+            return "N/A"
+        value = float(c.price[row])
+        return int(value) if c.price_kind[row] == PRICE_INT else value
+
+    def meter_info(self, row):
+        c = self.columns
+        return (
+            str(c.meter_values[c.meter_codes[row]]),
+            str(c.sku_values[c.sku_codes[row]]),
+            str(c.product_values[c.product_codes[row]]),
+        )
+
+
+def _side(prices):
+    return _ColumnSide(prices) if isinstance(prices, SnapshotColumns) else _RecordSide(prices)
+
+
+def _row_keys(side, rows, region_rank, meter_ids, meter_count):
+    """(region, meter) join key of the given rows, plus each row's position within its region."""
+    counts = np.diff(side.region_offsets)
+    region_of_row = np.repeat(np.arange(len(side.regions), dtype=np.int64), counts)[rows]
+    position = rows - side.region_offsets[region_of_row]
+    keys = region_rank[region_of_row] * meter_count + meter_ids[side.meter_codes[rows]]
+    return keys, position
+
+
+def _region_rows(side, region):
+    if region not in side.regions:
+        return np.array([], dtype=np.int64)
+    i = side.regions.index(region)
+    return np.arange(side.region_offsets[i], side.region_offsets[i + 1], dtype=np.int64)
+
+
+def _rows_in_models(side, rows, models):
+    group_keys = [parse_meter(*side.meter_info(row)).group_key for row in rows.tolist()]
+    return rows[np.array([key in models for key in group_keys], dtype=bool)]
+
+
+def _scope(prev, curr, previous_fingerprints, current_fingerprints):
+    """
+    Rows of each side that can hold a change, given both snapshots' fingerprints.
+
+    Regions with equal hashes are skipped. Within a changed region only the
+    models (group_keys) whose hashes differ are compared, provided neither
+    side repeats a meter in that region (so a meter can't sit in an unchanged
+    model on one side and a changed one on the other) and both fingerprints
+    grouped meters with the same parser version.
+    """
+    if previous_fingerprints is None or current_fingerprints is None:
+        return np.arange(len(prev.price), dtype=np.int64), np.arange(len(curr.price), dtype=np.int64)
+
+    prev_fp, curr_fp = previous_fingerprints["regions"], current_fingerprints["regions"]
+    same_grouping = previous_fingerprints.get("parser_version") == current_fingerprints.get("parser_version")
+
+    prev_rows, curr_rows = [np.array([], dtype=np.int64)], [np.array([], dtype=np.int64)]
+    for region in set(prev.regions) | set(curr.regions):
+        p_fp, c_fp = prev_fp.get(region), curr_fp.get(region)
+        if p_fp and c_fp and p_fp["hash"] == c_fp["hash"]:
+            continue
+        p_rows, c_rows = _region_rows(prev, region), _region_rows(curr, region)
+
+        if p_fp and c_fp and same_grouping and all(
+            len(set(names)) == len(names) for names in (prev.meter_names(p_rows), curr.meter_names(c_rows))
+        ):
+            p_models, c_models = p_fp["models"], c_fp["models"]
+            models = {m for m in p_models.keys() | c_models.keys() if p_models.get(m) != c_models.get(m)}
+            p_rows, c_rows = _rows_in_models(prev, p_rows, models), _rows_in_models(curr, c_rows, models)
+
+        prev_rows.append(p_rows)
+        curr_rows.append(c_rows)
+    return np.sort(np.concatenate(prev_rows)), np.sort(np.concatenate(curr_rows))
+
+
+def _unique_meters(keys, position):
+    """
+    Collapse duplicate keys: returns (keys, pos, row) with one entry per key,
+    holding the first occurrence's position and the last occurrence's row.
+    """
+    rows = np.arange(len(keys), dtype=np.int64)
+    if pd.Index(keys).is_unique:
+        return keys, position, rows
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    ends = np.r_[starts[1:], len(keys)] - 1
+    first, last = order[starts], order[ends]
+    return sorted_keys[starts], position[first], last
+
+
+def diff_pricing(previous_prices, current_prices, previous_fingerprints=None, current_fingerprints=None):
+    """
+    Compare previous and current pricing to find changes.
+
+    Same result, order and change dict layout as the original per-region loop:
+    regions in sorted order; within a region, increased/decreased/new meters in
+    the current snapshot's order, then removed meters in the previous one's.
+
+    With both snapshots' fingerprints (utils/fingerprints.py), only regions
+    and models whose hashes differ are compared.
+    """
+    if previous_fingerprints is not None and current_fingerprints is not None:
+        # Drop unchanged regions before any per-row work
+        prev_fp, curr_fp = previous_fingerprints["regions"], current_fingerprints["regions"]
+
+        def unchanged(region):
+            return region in prev_fp and region in curr_fp and prev_fp[region]["hash"] == curr_fp[region]["hash"]
+
+        if not isinstance(previous_prices, SnapshotColumns):
+            previous_prices = {r: items for r, items in previous_prices.items() if not unchanged(r)}
+        if not isinstance(current_prices, SnapshotColumns):
+            current_prices = {r: items for r, items in current_prices.items() if not unchanged(r)}
+
+    prev, curr = _side(previous_prices), _side(current_prices)
+    prev_scope, curr_scope = _scope(prev, curr, previous_fingerprints, current_fingerprints)
+    regions = sorted(set(prev.regions) | set(curr.regions))
+    rank = {region: i for i, region in enumerate(regions)}
+
+    # Shared integer ids for meter names, so (region, meter) joins on int64 keys
+    meter_ids, meter_names = pd.factorize(np.concatenate([prev.meter_vocab, curr.meter_vocab]))
+    meter_count = max(len(meter_names), 1)
+    prev_ids, curr_ids = meter_ids[:len(prev.meter_vocab)], meter_ids[len(prev.meter_vocab):]
+
+    prev_keys, prev_pos, prev_rows = _unique_meters(*_row_keys(
+        prev, prev_scope, np.array([rank[r] for r in prev.regions], dtype=np.int64), prev_ids, meter_count))
+    curr_keys, curr_pos, curr_rows = _unique_meters(*_row_keys(
+        curr, curr_scope, np.array([rank[r] for r in curr.regions], dtype=np.int64), curr_ids, meter_count))
+    prev_rows, curr_rows = prev_scope[prev_rows], curr_scope[curr_rows]
+
+    # Outer join: match each current key against the previous snapshot and vice versa
+    match_prev = pd.Index(prev_keys).get_indexer(curr_keys)
+    in_prev = match_prev >= 0
+    is_removed = pd.Index(curr_keys).get_indexer(prev_keys) < 0
+
+    p = np.full(len(curr_keys), np.nan)
+    p_na = np.ones(len(curr_keys), dtype=bool)
+    p_row = np.full(len(curr_keys), -1, dtype=np.int64)
+    p_row[in_prev] = prev_rows[match_prev[in_prev]]
+    p[in_prev] = prev.price[p_row[in_prev]]
+    p_na[in_prev] = prev.na[p_row[in_prev]]
+    c, c_na = curr.price[curr_rows], curr.na[curr_rows]
+
+    changed = in_prev & ~p_na & ~c_na & (p != c)
+    is_new = ~in_prev
+
+    # Changed/new rows (current order) and removed rows (previous order), sorted together
+    pick_curr = np.flatnonzero(changed | is_new)
+    pick_prev = np.flatnonzero(is_removed)
+    section = np.r_[np.zeros(len(pick_curr), dtype=np.int8), np.ones(len(pick_prev), dtype=np.int8)]
+    keys = np.r_[curr_keys[pick_curr], prev_keys[pick_prev]]
+    position = np.r_[curr_pos[pick_curr], prev_pos[pick_prev]]
+    order = np.lexsort((position, section, keys // meter_count))
+    index = np.r_[pick_curr, pick_prev][order]
+    section = section[order]
+    region_rank = (keys // meter_count)[order]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change_pct = np.where(p > 0, ((c - p) / p) * 100, 100.0)
+    increased = c > p
+
+    changes = []
+    sources = []
+    for i, rank_i, removed in zip(index.tolist(), region_rank.tolist(), section.tolist()):
+        region = regions[rank_i]
+        if removed:
+            row = int(prev_rows[i])
+            source = prev.meter_info(row)
+            change = {
+                "region": region,
+                "meter": source[0],
+                "product": source[2],
+                "change_type": "removed",
+                "old_price": prev.price_value(row),
+                "new_price": None,
+                "change_pct": None,
+            }
+        elif changed[i]:
+            row = int(curr_rows[i])
+            source = curr.meter_info(row)
+            change = {
+                "region": region,
+                "meter": source[0],
+                "product": source[2],
+                "change_type": "increased" if increased[i] else "decreased",
+                "old_price": prev.price_value(int(p_row[i])),
+                "new_price": curr.price_value(row),
+                "change_pct": round(float(change_pct[i]), 2),
+            }
+        else:
+            row = int(curr_rows[i])
+            source = curr.meter_info(row)
+            change = {
+                "region": region,
+                "meter": source[0],
+                "product": source[2],
+                "change_type": "new",
+                "old_price": None,
+                "new_price": curr.price_value(row),
+                "change_pct": None,
+            }
+        changes.append(change)
+        sources.append(source)
+
+    enrich_changes(changes, sources)
+    return changes
+
+
+def enrich_changes(changes, sources):
+    """Attach parsed meter fields to each change, parsing every distinct meter once.
+
+    sources[i] is the (meter, sku, product) triple change i was derived from.
+    """
+    columns = parse_meters_batch(sources)
+    for i, change in enumerate(changes):
+        for field in CHANGE_FIELDS:
+            change[field] = columns[field][i]
@@ -0,0 +1,136 @@
+"""
+Compact Pricing Records
+
+Slotted record types for the two structures that exist once per meter per
+region in a full pricing snapshot:
+
+  - PriceEntry:  one catalogue row (Meter, Price, Unit, Product, SkuName)
+  - ParsedMeter: the fields parse_meter extracts from a meter name
+
+Both store their values in __slots__ instead of a per-instance dict, and their
+strings (meter names, units, product names, deployments, tiers, ...) are
+interned, so the rows that repeat the same meter in every region, or share
+e.g. "1M" or "Azure OpenAI", point at a single string object.
+
+They also behave as (read-only) mappings keyed by the original field names,
+so dict-style callers keep working unchanged:
+
+    entry["Price"], entry.get("SkuName", ""), {**entry, **parsed}, dict(entry)
+
+Hot loops can use attribute access (entry.Price, parsed.group_key) instead.
+Use to_dict()/records_to_dicts() where a real dict is required (e.g. json.dump).
+"""
+
+import sys
+from collections.abc import Mapping
+
+
+class _SlottedRecord(Mapping):
+    """Read-only Mapping view over a record's __slots__ fields."""
+
+    __slots__ = ()
+    _fields = ()
+    _field_set = frozenset()
+
+    def __getitem__(self, key):
+        if key not in self._field_set:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __contains__(self, key):
+        return key in self._field_set
+
+    def __repr__(self):
+        values = ", ".join(f"{f}={getattr(self, f)!r}" for f in self._fields)
+        return f"{type(self).__name__}({values})"
+
+    def __reduce__(self):
+        return (type(self), tuple(getattr(self, f) for f in self._fields))
+
+    def to_dict(self):
+        return {f: getattr(self, f) for f in self._fields}
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+class PriceEntry(_SlottedRecord):
+    """One pricing row, as produced by fetch_pricing_as_list and stored in snapshots."""
+
+    __slots__ = ("Meter", "Price", "Unit", "Product", "SkuName")
+    _fields = __slots__
+    _field_set = frozenset(__slots__)
+
+    def __init__(self, Meter, Price, Unit, Product, SkuName=""):
+        self.Meter = _intern(Meter)
+        self.Price = Price
+        self.Unit = _intern(Unit)
+        self.Product = _intern(Product)
+        self.SkuName = _intern(SkuName)
+
+    @classmethod
+    def from_dict(cls, item):
+        return cls(
+            item["Meter"],
+            item["Price"],
+            item.get("Unit", "N/A"),
+            item.get("Product", ""),
+            item.get("SkuName", ""),
+        )
+
+
+class ParsedMeter(_SlottedRecord):
+    """
+    Structured fields parsed from a meter name (see utils.meter_parser.parse_meter).
+
+    Instances are shared through parse_meter's memo, so they are immutable.
+    """
+
+    __slots__ = (
+        "model", "variant", "version", "capability", "deployment", "tier", "direction",
+        "media_type", "display_name", "group_key",
+    )
+    _fields = __slots__
+    _field_set = frozenset(__slots__)
+
+    def __init__(self, model="", variant="", version="", capability="", deployment="",
+                 tier="Standard", direction="", media_type="", display_name="", group_key=""):
+        set_ = object.__setattr__
+        for name, value in zip(self._fields, (model, variant, version, capability, deployment,
+                                              tier, direction, media_type, display_name, group_key)):
+            set_(self, name, _intern(value))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    @classmethod
+    def from_dict(cls, fields):
+        return cls(**{f: fields[f] for f in cls._fields if f in fields})
+
+
+def price_entries(items):
+    """Convert a list of pricing dicts to PriceEntry records (records pass through)."""
+    return [item if type(item) is PriceEntry else PriceEntry.from_dict(item) for item in items]
+
+
+def price_entries_by_region(prices):
+    """Convert a {region: [items]} snapshot to PriceEntry records."""
+    return {region: price_entries(items) for region, items in prices.items()}
+
+
+def records_to_dicts(obj):
+    """Recursively replace records with plain dicts, e.g. before json.dump."""
+    if isinstance(obj, _SlottedRecord):
+        return obj.to_dict()
+    if isinstance(obj, dict):
+        return {k: records_to_dicts(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [records_to_dicts(v) for v in obj]
+    return obj
@@ -0,0 +1,190 @@
+"""
+Streaming RSS Reader
+
+Reads the items of an RSS 2.0 (or Atom) feed as its bytes arrive, using
+xml.etree's XMLPullParser, and keeps only what the status checks use:
+
+    {"title": ..., "summary": ..., "published": ..., "link": ...}
+
+(summary is the item's description, or an Atom entry's summary/content;
+published is its pubDate, or published/updated, as written in the feed).
+
+    for item in iter_rss_items(chunks, limit=10):           # any iterable of bytes
+        ...
+    async for item in aiter_rss_items(resp.aiter_bytes(), limit=10):
+        ...
+
+Reading stops after `limit` items, and each item's elements are dropped
+once it has been read.
+
+Feeds are not always well-formed (an undefined entity like &nbsp;, a stray
+"&" or "<"). When the XML parser gives up, the reader falls back to a
+lenient scan of the <item>/<entry> blocks in the bytes read so far and
+carries on from the first item it hadn't returned yet, so one bad
+character costs at most the fields it garbles, not the whole feed. The raw
+bytes are kept for that fallback, up to the point where reading stops.
+"""
+
+import html
+import re
+from xml.etree.ElementTree import ParseError, XMLPullParser
+
+ITEM_TAGS = {"item", "entry"}
+
+# Item child element -> field; the first one present wins
+FIELD_TAGS = {
+    "title": "title",
+    "description": "summary",
+    "summary": "summary",
+    "content": "summary",
+    "pubDate": "published",
+    "published": "published",
+    "updated": "published",
+    "link": "link",
+}
+
+
+FIELDS = ("title", "summary", "published", "link")
+
+# Lenient fallback: item blocks, their child elements, and attribute / CDATA parts
+_ITEM_RE = re.compile(rb"<(?:[\w.-]+:)?(item|entry)\b[^>]*>(.*?)</(?:[\w.-]+:)?\1\s*>", re.S)
+_CHILD_RE = re.compile(
+    r"<(?:[\w.-]+:)?(" + "|".join(FIELD_TAGS) + r")\b([^>]*?)(?:/>|>(.*?)</(?:[\w.-]+:)?\1\s*>)", re.S
+)
+_HREF_RE = re.compile(r"""\bhref\s*=\s*["']([^"']*)["']""")
+_CDATA_RE = re.compile(r"<!\[CDATA\[(.*?)\]\]>", re.S)
+
+
+def _local_name(tag):
+    """Tag without its namespace ("{http://www.w3.org/2005/Atom}entry" -> "entry")."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _scan_item(block):
+    """Fields of one raw <item>/<entry> body, read with regexes instead of an XML parser."""
+    item = {}
+    for tag, attrs, content in _CHILD_RE.findall(block.decode("utf-8", errors="replace")):
+        field = FIELD_TAGS[tag]
+        if field in item:
+            continue
+        href = _HREF_RE.search(attrs) if field == "link" else None
+        if href:
+            item[field] = html.unescape(href.group(1))
+        else:
+            parts = _CDATA_RE.split(content)
+            # split() alternates text outside CDATA sections (escaped) and inside them (literal)
+            item[field] = "".join(html.unescape(part) if i % 2 == 0 else part for i, part in enumerate(parts)).strip()
+    return {field: item.get(field, "") for field in FIELDS}
+
+
+class RssParser:
+    """Incremental feed parser: feed() bytes, get back the items they completed."""
+
+    def __init__(self):
+        self._parser = XMLPullParser(events=("start", "end"))
+        self._depth = 0
+        self._item_depth = None
+        self._item = None
+        self._raw = bytearray()
+        self._returned = 0
+        self._scan_from = None  # offset into _raw once in fallback mode
+
+    def feed(self, data):
+        self._raw += data
+        if self._scan_from is None:
+            try:
+                self._parser.feed(data)
+                return self._counted(self._read_items())
+            except ParseError:
+                self._start_scan()
+        return self._scan()
+
+    def close(self):
+        """Finish the document; items a malformed tail still holds are recovered by the fallback scan."""
+        if self._scan_from is None:
+            try:
+                self._parser.close()
+                return self._counted(self._read_items())
+            except ParseError:
+                self._start_scan()
+        return self._scan()
+
+    def _counted(self, items):
+        self._returned += len(items)
+        return items
+
+    def _start_scan(self):
+        """Switch to the lenient scan, past the items the XML parser already returned."""
+        self._scan_from = 0
+        for skipped, match in enumerate(_ITEM_RE.finditer(self._raw)):
+            if skipped == self._returned:
+                break
+            self._scan_from = match.end()
+
+    def _scan(self):
+        items = []
+        for match in _ITEM_RE.finditer(self._raw, self._scan_from):
+            items.append(_scan_item(match.group(2)))
+            self._scan_from = match.end()
+        # Everything before the last complete item is no longer needed
+        del self._raw[:self._scan_from]
+        self._scan_from = 0
+        return self._counted(items)
+
+    def _read_items(self):
+        items = []
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                self._depth += 1
+                if self._item is None and _local_name(elem.tag) in ITEM_TAGS:
+                    self._item, self._item_depth = {}, self._depth
+                continue
+
+            self._depth -= 1
+            if self._item is None:
+                continue
+            if self._depth == self._item_depth:
+                # A direct child of the item
+                field = FIELD_TAGS.get(_local_name(elem.tag))
+                if field and field not in self._item:
+                    if field == "link" and elem.get("href"):
+                        self._item[field] = elem.get("href")
+                    else:
+                        self._item[field] = (elem.text or "").strip()
+            elif self._depth == self._item_depth - 1:
+                items.append({field: self._item.get(field, "") for field in FIELDS})
+                self._item = None
+                elem.clear()
+        return items
+
+
+def iter_rss_items(chunks, limit=None):
+    """Yield up to `limit` items of a feed read from an iterable of byte chunks."""
+    parser, count = RssParser(), 0
+    for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+            count += 1
+            if count == limit:
+                return
+    for item in parser.close():
+        yield item
+        count += 1
+        if count == limit:
+            return
+
+
+async def aiter_rss_items(chunks, limit=None):
+    """Async counterpart of iter_rss_items, for e.g. httpx Response.aiter_bytes()."""
+    parser, count = RssParser(), 0
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+            count += 1
+            if count == limit:
+                return
+    for item in parser.close():
+        yield item
+        count += 1
+        if count == limit:
+            return
@@ -0,0 +1,401 @@
+"""
+Pricing Snapshot Store
+
+Reads and writes the pricing monitor's snapshots ({"timestamp": ..., "prices":
+{region: [items]}}) in one of two formats, chosen by file extension:
+
+  - .json  readable JSON that stores each distinct meter once, with the
+           regions charging each of its prices (see the JSON section below)
+  - .npz   a columnar NumPy archive: one row per (region, meter) with
+           dictionary-encoded string columns, so the file holds each distinct
+           meter/unit/product string once plus small integer code arrays
+
+Both load to the same structure, with items as PriceEntry records, and both
+carry the snapshot's fingerprints (utils/fingerprints.py), computed at save
+time so the diff can skip unchanged regions and models.
+
+load_snapshot_columns() returns the columns without building per-row
+records, for code that works on whole arrays.
+
+Convert between formats (run from project root):
+    python src/utils/snapshot_store.py data/pricing_current.json data/pricing_current.npz
+"""
+
+import io
+import json
+import os
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import numpy as np
+
+# Path setup — allow running as a script
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from utils.fingerprints import pricing_fingerprints
+from utils.records import PriceEntry, price_entries_by_region, records_to_dicts
+
+NPZ_FORMAT_VERSION = 1
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "data")
+
+# "json" (default, smaller, readable diffs in git) or "npz" (columnar, a little faster to load and save)
+SNAPSHOT_FORMATS = ("json", "npz")
+SNAPSHOT_FORMAT = os.environ.get("PRICING_SNAPSHOT_FORMAT", "json")
+if SNAPSHOT_FORMAT not in SNAPSHOT_FORMATS:
+    raise ValueError(f"PRICING_SNAPSHOT_FORMAT must be one of {SNAPSHOT_FORMATS}, got {SNAPSHOT_FORMAT!r}")
+
+# The pricing monitor's two snapshots, in the configured format
+PREVIOUS_SNAPSHOT_PATH = os.path.join(DATA_DIR, f"pricing_previous.{SNAPSHOT_FORMAT}")
+CURRENT_SNAPSHOT_PATH = os.path.join(DATA_DIR, f"pricing_current.{SNAPSHOT_FORMAT}")
+
+# price_kind values: how to turn the float64 price column back into the original value
+PRICE_FLOAT, PRICE_INT, PRICE_NA = 0, 1, 2
+
+
+@dataclass
+class SnapshotColumns:
+    """
+    A snapshot as parallel row arrays.
+
+    Rows are grouped by region, in the snapshot's region order; rows of
+    regions[i] are region_offsets[i]:region_offsets[i + 1]. String columns
+    hold codes into the matching *_values array.
+    """
+
+    timestamp: str
+    regions: list
+    region_offsets: np.ndarray
+    meter_codes: np.ndarray
+    meter_values: np.ndarray
+    unit_codes: np.ndarray
+    unit_values: np.ndarray
+    product_codes: np.ndarray
+    product_values: np.ndarray
+    sku_codes: np.ndarray
+    sku_values: np.ndarray
+    price: np.ndarray
+    price_kind: np.ndarray
+    fingerprints: dict = None
+
+    def __len__(self):
+        return len(self.price)
+
+    def region_codes(self):
+        """Region index of every row."""
+        return np.repeat(np.arange(len(self.regions), dtype=np.int32), np.diff(self.region_offsets))
+
+    @classmethod
+    def from_prices(cls, prices, timestamp, fingerprints=None):
+        """Column-encode a {region: [items]} snapshot (records or dicts)."""
+        vocabularies = ({}, {}, {}, {})
+        meter_ids, unit_ids, product_ids, sku_ids = vocabularies
+        meter_codes, unit_codes, product_codes, sku_codes = [], [], [], []
+        price, price_kind = [], []
+        offsets = [0]
+
+        for items in prices.values():
+            for item in items:
+                meter_codes.append(meter_ids.setdefault(item["Meter"], len(meter_ids)))
+                unit_codes.append(unit_ids.setdefault(item.get("Unit", "N/A"), len(unit_ids)))
+                product_codes.append(product_ids.setdefault(item.get("Product", ""), len(product_ids)))
+                sku_codes.append(sku_ids.setdefault(item.get("SkuName", ""), len(sku_ids)))
+
+                value = item["Price"]
+                if isinstance(value, float):
+                    price.append(value)
+                    price_kind.append(PRICE_FLOAT)
+                elif isinstance(value, int) and not isinstance(value, bool):
+                    price.append(float(value))
+                    price_kind.append(PRICE_INT)
+                elif value == "N/A":
+                    price.append(np.nan)
+                    price_kind.append(PRICE_NA)
+                else:
+                    raise ValueError(f"Unsupported price {value!r} for meter {item['Meter']!r}")
+            offsets.append(len(price))
+
+        def values(ids):
+            return np.array(list(ids), dtype=str) if ids else np.array([], dtype=str)
+
+        return cls(
+            timestamp=timestamp,
+            regions=list(prices),
+            region_offsets=np.array(offsets, dtype=np.int64),
+            meter_codes=np.array(meter_codes, dtype=np.int32),
+            meter_values=values(meter_ids),
+            unit_codes=np.array(unit_codes, dtype=np.int32),
+            unit_values=values(unit_ids),
+            product_codes=np.array(product_codes, dtype=np.int32),
+            product_values=values(product_ids),
+            sku_codes=np.array(sku_codes, dtype=np.int32),
+            sku_values=values(sku_ids),
+            price=np.array(price, dtype=np.float64),
+            price_kind=np.array(price_kind, dtype=np.uint8),
+            fingerprints=fingerprints,
+        )
+
+    def to_prices(self):
+        """Materialize the {region: [PriceEntry]} snapshot."""
+        meters = self.meter_values.tolist()
+        units = self.unit_values.tolist()
+        products = self.product_values.tolist()
+        skus = self.sku_values.tolist()
+
+        prices = self.price.tolist()
+        for i in np.flatnonzero(self.price_kind == PRICE_INT).tolist():
+            prices[i] = int(prices[i])
+        for i in np.flatnonzero(self.price_kind == PRICE_NA).tolist():
+            prices[i] = "N/A"
+
+        rows = [
+            PriceEntry(meters[m], p, units[u], products[pr], skus[s])
+            for m, p, u, pr, s in zip(
+                self.meter_codes.tolist(), prices, self.unit_codes.tolist(),
+                self.product_codes.tolist(), self.sku_codes.tolist(),
+            )
+        ]
+        offsets = self.region_offsets.tolist()
+        return {region: rows[offsets[i]:offsets[i + 1]] for i, region in enumerate(self.regions)}
+
+
+# --- JSON ---
+#
+# Written "by meter": every distinct (Meter, Unit, Product, SkuName) is stored
+# once, with each of its prices followed by the regions that charge it:
+#
+#     {
+#       "timestamp": "...",
+#       "format": "by-meter",
+#       "fingerprints": {...},
+#       "regions": ["eastus", "westus", ...],        # snapshot region order
+#       "meters": [
+#         ["gpt 4o inp gl", "1K", "Azure OpenAI", "", [[0.0025, ["eastus", "westus"]], [0.00275, ["brazilsouth"]]]],
+#         ...
+#       ],
+#       "unordered": {"region": [items]}              # regions stored verbatim (see below)
+#     }
+#
+# Regions' rows are rebuilt in `meters` order, which is sorted; a region whose
+# rows aren't in that order, or that repeats a meter, is kept verbatim under
+# "unordered". One meter per line means a price change touches one line.
+# Files in the original {"timestamp", "prices"} layout are still read.
+
+JSON_FORMAT = "by-meter"
+
+
+def _meter_key(item):
+    return item["Meter"], item.get("Unit", "N/A"), item.get("Product", ""), item.get("SkuName", "")
+
+
+def _encode_by_meter(prices):
+    """Split a {region: [items]} snapshot into (regions, meters, unordered)."""
+    buckets = {}  # meter key -> {price key: (price, [regions])}
+    unordered = {}
+    for region, items in prices.items():
+        keys = [_meter_key(item) for item in items]
+        if keys != sorted(keys) or len(set(keys)) != len(keys):
+            unordered[region] = records_to_dicts(items)
+            continue
+        for key, item in zip(keys, items):
+            price = item["Price"]
+            # Key prices by type too, so 1 and 1.0 stay distinct
+            bucket = buckets.setdefault(key, {}).setdefault((type(price).__name__, price), (price, []))
+            bucket[1].append(region)
+
+    meters = [[*key, [[price, regions] for price, regions in buckets[key].values()]] for key in sorted(buckets)]
+    return list(prices), meters, unordered
+
+
+def _decode_by_meter(data):
+    prices = {region: [] for region in data["regions"]}
+    for meter, unit, product, sku, price_regions in data["meters"]:
+        for price, regions in price_regions:
+            for region in regions:
+                prices[region].append(PriceEntry(meter, price, unit, product, sku))
+    for region, items in data.get("unordered", {}).items():
+        prices[region] = [PriceEntry.from_dict(item) for item in items]
+    return prices
+
+
+def load_json(path):
+    """Load a pricing JSON file, with its items as PriceEntry records. Returns None if it doesn't exist."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return _snapshot_from_json(json.load(f))
+
+
+def _snapshot_from_json(data):
+    if data.get("format") == JSON_FORMAT:
+        prices = _decode_by_meter(data)
+    else:
+        prices = price_entries_by_region(data.get("prices", {}))
+    return {"timestamp": data.get("timestamp"), "fingerprints": data.get("fingerprints"), "prices": prices}
+
+
+def save_json(path, prices, timestamp=None, fingerprints=None):
+    """Save pricing data to a JSON file with timestamp (and fingerprints, if given)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    regions, meters, unordered = _encode_by_meter(prices)
+    dump = json.dumps
+
+    lines = ["{"]
+    lines.append(f'"timestamp": {dump(timestamp or datetime.now(timezone.utc).isoformat())},')
+    lines.append(f'"format": {dump(JSON_FORMAT)},')
+    if fingerprints is not None:
+        lines.append(f'"fingerprints": {{"parser_version": {dump(fingerprints["parser_version"])}, "regions": {{')
+        lines.append(",\n".join(f"{dump(r)}: {dump(fp)}" for r, fp in fingerprints["regions"].items()))
+        lines.append("}},")
+    lines.append(f'"regions": {dump(regions)},')
+    lines.append('"meters": [')
+    lines.append(",\n".join(dump(meter) for meter in meters))
+    lines.append("],")
+    lines.append(f'"unordered": {dump(unordered, indent=2)}')
+    lines.append("}")
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp_path, path)
+
+
+# --- NPZ ---
+
+def load_snapshot_columns(path):
+    """Load an .npz snapshot as SnapshotColumns. Returns None if it doesn't exist."""
+    if not os.path.exists(path):
+        return None
+    return _columns_from_npz(path, path)
+
+
+def _columns_from_npz(file, name):
+    with np.load(file, allow_pickle=False) as npz:
+        if int(npz["format_version"]) != NPZ_FORMAT_VERSION:
+            raise ValueError(f"{name}: unsupported snapshot format version {int(npz['format_version'])}")
+        return SnapshotColumns(
+            timestamp=str(npz["timestamp"]),
+            regions=npz["regions"].tolist(),
+            region_offsets=npz["region_offsets"],
+            meter_codes=npz["meter_codes"],
+            meter_values=npz["meter_values"],
+            unit_codes=npz["unit_codes"],
+            unit_values=npz["unit_values"],
+            product_codes=npz["product_codes"],
+            product_values=npz["product_values"],
+            sku_codes=npz["sku_codes"],
+            sku_values=npz["sku_values"],
+            price=npz["price"],
+            price_kind=npz["price_kind"],
+            fingerprints=json.loads(npz["fingerprints"].tobytes()) if "fingerprints" in npz.files else None,
+        )
+
+
+def save_snapshot_columns(path, columns):
+    """Write SnapshotColumns to an .npz file (atomically)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    extra = {}
+    if columns.fingerprints is not None:
+        # UTF-8 bytes rather than a numpy str scalar, which would store UTF-32
+        extra["fingerprints"] = np.frombuffer(json.dumps(columns.fingerprints).encode("utf-8"), dtype=np.uint8)
+    with open(tmp_path, "wb") as f:
+        np.savez(
+            f,
+            format_version=np.array(NPZ_FORMAT_VERSION),
+            timestamp=np.array(columns.timestamp),
+            regions=np.array(columns.regions, dtype=str),
+            region_offsets=columns.region_offsets,
+            meter_codes=columns.meter_codes,
+            meter_values=columns.meter_values,
+            unit_codes=columns.unit_codes,
+            unit_values=columns.unit_values,
+            product_codes=columns.product_codes,
+            product_values=columns.product_values,
+            sku_codes=columns.sku_codes,
+            sku_values=columns.sku_values,
+            price=columns.price,
+            price_kind=columns.price_kind,
+            **extra,
+        )
+    os.replace(tmp_path, path)
+
+
+# --- Format dispatch ---
+
+def other_format_paths(path):
+    """The same snapshot path with each other format's extension."""
+    stem, ext = os.path.splitext(path)
+    return [f"{stem}.{fmt}" for fmt in SNAPSHOT_FORMATS if f".{fmt}" != ext]
+
+
+def existing_snapshot_path(path):
+    """path if it exists, else the first existing copy in another format, else None."""
+    for candidate in [path] + other_format_paths(path):
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def load_snapshot(path):
+    """
+    Load a snapshot (.json or .npz) as
+        {"timestamp": str, "fingerprints": dict | None, "prices": {region: [PriceEntry]}}
+    (fingerprints is None for files written before they were added).
+
+    If path doesn't exist but the same snapshot does in the other format (e.g.
+    after PRICING_SNAPSHOT_FORMAT changed), that file is loaded instead.
+    Returns None if neither exists.
+    """
+    path = existing_snapshot_path(path)
+    if path is None:
+        return None
+    if path.endswith(".npz"):
+        columns = load_snapshot_columns(path)
+        if columns is None:
+            return None
+        return {"timestamp": columns.timestamp, "fingerprints": columns.fingerprints, "prices": columns.to_prices()}
+    return load_json(path)
+
+
+def save_snapshot(path, prices, timestamp=None, fingerprints=None):
+    """
+    Save a {region: [items]} snapshot as .json or .npz, depending on the path's extension.
+    Fingerprints are computed from prices unless already given.
+    """
+    timestamp = timestamp or datetime.now(timezone.utc).isoformat()
+    if fingerprints is None:
+        fingerprints = pricing_fingerprints(prices)
+    if path.endswith(".npz"):
+        save_snapshot_columns(path, SnapshotColumns.from_prices(prices, timestamp, fingerprints))
+    else:
+        save_json(path, prices, timestamp, fingerprints)
+
+
+def decode_snapshot(raw, name):
+    """
+    Decode the bytes of a snapshot file (e.g. a git blob) into the structure
+    load_snapshot() returns; the format is picked by name's extension.
+    """
+    if name.endswith(".npz"):
+        columns = _columns_from_npz(io.BytesIO(raw), name)
+        return {"timestamp": columns.timestamp, "fingerprints": columns.fingerprints, "prices": columns.to_prices()}
+    return _snapshot_from_json(json.loads(raw))
+
+
+def convert_snapshot(src, dst):
+    """Re-encode a snapshot file in the format given by dst's extension, keeping its timestamp."""
+    data = load_snapshot(src)
+    if data is None:
+        raise FileNotFoundError(src)
+    save_snapshot(dst, data["prices"], data.get("timestamp"))
+    return sum(len(items) for items in data["prices"].values())
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python src/utils/snapshot_store.py <source.json|.npz> <destination.json|.npz>")
+        sys.exit(1)
+    rows = convert_snapshot(sys.argv[1], sys.argv[2])
+    print(f"Converted {sys.argv[1]} -> {sys.argv[2]} ({rows} rows)")
@@ -0,0 +1,121 @@
+"""
+Commit a few weekly snapshots to a throwaway git repo, rotated the way the
+weekly workflow does, and check that the backfill builds the same history
+as recording the snapshots one by one, including into a history that
+already holds snapshots older, newer than, or between the committed ones.
+Run from project root: python tests/test_history_backfill.py
+"""
+import json
+import sys
+import os
+import subprocess
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from utils.history_backfill import backfill_history
+from utils.price_history import PriceHistory
+from utils.snapshot_store import save_snapshot
+
+
+def item(meter, price):
+    return {"Meter": meter, "Price": price, "Unit": "1K", "Product": "Azure OpenAI"}
+
+
+WEEKS = [
+    ("2026-01-05T09:00:00+00:00", {"eastus": [item("gpt 4o inp gl", 0.0025), item("o1 inp gl", 0.015)]}),
+    ("2026-01-12T09:00:00+00:00", {"eastus": [item("gpt 4o inp gl", 0.0025), item("o1 inp gl", 0.015)]}),
+    ("2026-01-19T09:00:00+00:00", {"eastus": [item("gpt 4o inp gl", 0.002), item("o3 inp gl", 0.002)]}),
+    ("2026-01-26T09:00:00+00:00", {"eastus": [item("gpt 4o inp gl", "N/A"), item("o3 inp gl", 0.002)],
+                                   "westus": [item("o3 inp gl", 0.0021)]}),
+]
+
+# Recorded by the monitor but never committed: after the git weeks, and between two of them
+NEWER_WEEK = ("2026-02-02T09:00:00+00:00", {"eastus": [item("o3 inp gl", 0.0018)], "westus": [item("o3 inp gl", 0.0021)]})
+BETWEEN_WEEK = ("2026-01-15T09:00:00+00:00", {"eastus": [item("gpt 4o inp gl", 0.0022), item("o1 inp gl", 0.015)]})
+
+
+def git(repo, *args):
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+def commit_weeks(repo):
+    git(repo, "init", "-q")
+    os.makedirs(os.path.join(repo, "data"))
+    current = os.path.join(repo, "data", "pricing_current.json")
+    for week, (timestamp, prices) in enumerate(WEEKS):
+        if os.path.exists(current):
+            os.replace(current, os.path.join(repo, "data", "pricing_previous.json"))
+        if week < 2:
+            with open(current, "w") as f:
+                json.dump({"timestamp": timestamp, "prices": prices}, f, indent=2)  # pre-"by-meter" layout
+        else:
+            save_snapshot(current, prices, timestamp)
+        git(repo, "add", "data")
+        git(repo, "-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "-m", f"week {week}")
+
+
+def dump(history):
+    return (
+        [tuple(row) for row in history.conn.execute("SELECT * FROM snapshots ORDER BY observed_at")],
+        [tuple(row) for row in history.conn.execute("SELECT * FROM prices ORDER BY observed_at, region, meter")],
+    )
+
+
+def record_all(path, weeks):
+    with PriceHistory(path) as history:
+        for timestamp, prices in sorted(weeks, key=lambda week: week[0]):
+            history.record_snapshot(timestamp, prices)
+        return dump(history)
+
+
+def test_backfill_history():
+    with tempfile.TemporaryDirectory() as tmp:
+        commit_weeks(tmp)
+        with PriceHistory(os.path.join(tmp, "expected.sqlite")) as history:
+            for timestamp, prices in WEEKS:
+                history.record_snapshot(timestamp, prices)
+            expected = dump(history)
+
+        with PriceHistory(os.path.join(tmp, "backfilled.sqlite")) as history:
+            assert backfill_history(history, tmp, workers=2) == len(WEEKS)
+            assert dump(history) == expected
+            assert backfill_history(history, tmp, workers=2) == 0
+
+        # An existing history only gets the newer snapshots
+        with PriceHistory(os.path.join(tmp, "partial.sqlite")) as history:
+            history.record_snapshot(*WEEKS[0])
+            assert backfill_history(history, tmp, workers=2) == len(WEEKS) - 1
+            assert dump(history) == expected
+
+
+def test_backfill_into_newer_history():
+    with tempfile.TemporaryDirectory() as tmp:
+        commit_weeks(tmp)
+
+        # The monitor's first run already recorded a week newer than everything in git
+        expected = record_all(os.path.join(tmp, "expected.sqlite"), WEEKS + [NEWER_WEEK])
+        with PriceHistory(os.path.join(tmp, "newer.sqlite")) as history:
+            history.record_snapshot(*NEWER_WEEK)
+            assert backfill_history(history, tmp, workers=2) == len(WEEKS)
+            assert dump(history) == expected
+            assert backfill_history(history, tmp, workers=2) == 0
+            assert dump(history) == expected
+
+        # The change log was rewritten too: a database rebuilt from it matches
+        with PriceHistory(os.path.join(tmp, "from-log.sqlite"), os.path.join(tmp, "newer.jsonl")) as history:
+            assert dump(history) == expected
+
+        # Recorded weeks between and after the committed ones are merged in order
+        expected = record_all(os.path.join(tmp, "expected-merged.sqlite"), WEEKS + [BETWEEN_WEEK, NEWER_WEEK])
+        with PriceHistory(os.path.join(tmp, "merged.sqlite")) as history:
+            history.record_snapshot(*BETWEEN_WEEK)
+            history.record_snapshot(*NEWER_WEEK)
+            assert backfill_history(history, tmp, workers=2) == len(WEEKS)
+            assert dump(history) == expected
+
+
+if __name__ == "__main__":
+    test_backfill_history()
+    test_backfill_into_newer_history()
+    print("Backfilled history matches.")
@@ -0,0 +1,129 @@
+"""
+Check the disk-backed HTTP cache: TTL freshness, validator headers, 304
+revalidation with touch(), size-based eviction (oldest first, tolerating
+files that vanish mid-scan), and that Retail Prices pages are only decoded
+and cached from successful responses.
+Run from project root: python tests/test_http_cache.py
+"""
+import json
+import sys
+import os
+import tempfile
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import providers.azure as azure
+import utils.http_cache as http_cache
+from utils.http_cache import DiskCache
+
+URL = "https://prices.example/api?page=1"
+PAGE = {"Items": [{"meterName": "gpt 4o inp gl"}], "NextPageLink": None}
+
+
+def test_freshness_and_validators():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = DiskCache(tmp, ttl=60)
+        assert cache.get(URL) is None
+        assert not cache.is_fresh(None)
+        assert cache.validator_headers(None) == {}
+
+        entry = cache.put(URL, "body", httpx.Headers({"ETag": '"v1"', "Last-Modified": "Mon, 05 Jan 2026 09:00:00 GMT"}))
+        assert cache.get(URL) == entry
+        assert cache.get(URL + "&other=1") is None
+        assert cache.is_fresh(entry)
+        assert cache.validator_headers(entry) == {
+            "If-None-Match": '"v1"', "If-Modified-Since": "Mon, 05 Jan 2026 09:00:00 GMT",
+        }
+
+        # Expired: revalidated, and a 304 makes it fresh again
+        entry["stored_at"] = time.time() - 120
+        assert not cache.is_fresh(entry)
+        cache.touch(entry)
+        assert cache.is_fresh(cache.get(URL))
+        assert not DiskCache(tmp, ttl=0).is_fresh(cache.get(URL))
+
+        # No validators: nothing to revalidate with
+        assert cache.validator_headers(cache.put(URL, "body", {})) == {}
+
+
+def test_eviction():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = DiskCache(tmp, max_bytes=10_000)
+        for n in range(3):
+            cache.put(f"{URL}&n={n}", "x" * 3000, {})
+            # Distinct mtimes, oldest first
+            os.utime(cache._path(f"{URL}&n={n}"), (1000 + n, 1000 + n))
+        cache.put(f"{URL}&n=3", "x" * 3000, {})
+        assert [cache.get(f"{URL}&n={n}") is not None for n in range(4)] == [False, True, True, True]
+        assert cache._size == cache._disk_usage() <= 10_000
+
+
+def test_eviction_tolerates_vanished_files():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = DiskCache(tmp)
+        for n in range(3):
+            cache._write(f"{URL}&n={n}", {"url": f"{URL}&n={n}", "stored_at": 0, "body": "x" * 100})
+        entries = list(os.scandir(tmp))
+        # Another process evicts one of them after this one listed the directory
+        os.remove(entries[0].path)
+        original_scandir = http_cache.os.scandir
+        http_cache.os.scandir = lambda path: iter(entries)
+        cache.max_bytes = 1
+        try:
+            cache._evict()
+        finally:
+            http_cache.os.scandir = original_scandir
+        assert os.listdir(tmp) == []
+        assert cache._size == 0
+
+
+def fetch_page(handler):
+    with tempfile.TemporaryDirectory() as tmp:
+        original_cache, original_client = azure.pricing_cache, azure.client
+        azure.pricing_cache, azure.client = DiskCache(tmp, ttl=0), httpx.Client(transport=httpx.MockTransport(handler))
+        try:
+            results = []
+            for _ in range(2):
+                try:
+                    results.append(azure._get_pricing_page(URL))
+                except httpx.HTTPStatusError as e:
+                    results.append(e.response.status_code)
+            return results, os.listdir(tmp)
+        finally:
+            azure.client.close()
+            azure.pricing_cache, azure.client = original_cache, original_client
+
+
+def test_page_revalidation():
+    sent = []
+
+    def handler(request):
+        sent.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=PAGE, headers={"ETag": '"v1"'})
+
+    results, files = fetch_page(handler)
+    assert results == [PAGE, PAGE]
+    assert sent == [None, '"v1"']
+    assert len(files) == 1
+
+
+def test_page_errors_raise():
+    for status in (429, 503):
+        # An error body that would otherwise read as an empty, final page
+        results, files = fetch_page(lambda request: httpx.Response(status, json={"Items": [], "NextPageLink": None}))
+        assert results == [status, status], results
+        assert files == []
+
+
+if __name__ == "__main__":
+    test_freshness_and_validators()
+    test_eviction()
+    test_eviction_tolerates_vanished_files()
+    test_page_revalidation()
+    test_page_errors_raise()
+    print("HTTP cache checks passed.")
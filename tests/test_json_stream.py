@@ -0,0 +1,61 @@
+"""
+Check the streaming JSON array parser against json.loads for documents cut
+into chunks at every position, and that stopping early stops reading.
+Run from project root: python tests/test_json_stream.py
+"""
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from utils.json_stream import iter_json_array
+
+DOCUMENTS = [
+    "[]",
+    " [ ] ",
+    "[1, 2.5e3 ,-3, 12345]",
+    '[{"a": [1, {"b": "x]y,\\"z"}]}, "s", null, true, false, [], {}]',
+    json.dumps([{"service_name": "Vertex Gemini API", "external_desc": "é" * n, "number": n} for n in range(5)], indent=2),
+]
+
+MALFORMED = ["", '{"a": 1}', "[1", '[{"a":', "[1 2]", "[1,,2]", "[1,]", "[1x]"]
+
+
+def test_every_split():
+    for doc in DOCUMENTS:
+        expected = json.loads(doc)
+        for cut in range(len(doc) + 1):
+            assert list(iter_json_array([doc[:cut], doc[cut:]])) == expected, (doc, cut)
+        assert list(iter_json_array(list(doc))) == expected, doc
+
+
+def test_malformed():
+    for doc in MALFORMED:
+        try:
+            list(iter_json_array(list(doc)))
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted {doc!r}")
+
+
+def test_stops_reading():
+    read = []
+
+    def chunks():
+        yield "["
+        for n in range(1_000_000):
+            read.append(n)
+            yield json.dumps({"number": n}) + ","
+
+    for item in iter_json_array(chunks()):
+        if item["number"] == 19:
+            break
+    assert len(read) <= 21, len(read)
+
+
+if __name__ == "__main__":
+    test_every_split()
+    test_malformed()
+    test_stops_reading()
+    print("All streaming JSON checks passed.")
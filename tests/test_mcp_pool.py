@@ -0,0 +1,160 @@
+"""
+Check the pooled MCP sessions against a fake server (no network): sessions
+are reused and owned by one task, idle sessions are pinged before reuse,
+a failed call is retried on a new connection rather than another stale
+pooled one, idle sessions are reaped, and close() shuts everything down.
+Run from project root: python tests/test_mcp_pool.py
+"""
+import asyncio
+import sys
+import os
+from contextlib import asynccontextmanager
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import providers.mcp_pool as mcp_pool
+from providers.mcp_pool import McpSessionPool
+
+
+class FakeServer:
+    """Counts connections; restart() breaks every session opened before it."""
+
+    def __init__(self):
+        self.generation = 0
+        self.opened = 0
+        self.closed = 0
+        self.owner_mismatches = 0
+        self.pings = 0
+        self.failed_calls = 0
+
+    def restart(self):
+        self.generation += 1
+
+    def transport(self, url):
+        @asynccontextmanager
+        async def connect():
+            owner = asyncio.current_task()
+            self.opened += 1
+            try:
+                yield None, None, None
+            finally:
+                self.closed += 1
+                self.owner_mismatches += asyncio.current_task() is not owner
+        return connect()
+
+    def session(self, read, write):
+        server = self
+
+        class FakeSession:
+            async def __aenter__(self):
+                self.generation = server.generation
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            async def initialize(self):
+                pass
+
+            def _check(self):
+                if self.generation != server.generation:
+                    raise ConnectionError("session expired")
+
+            async def send_ping(self):
+                server.pings += 1
+                self._check()
+
+            async def call_tool(self, name, arguments):
+                try:
+                    self._check()
+                except ConnectionError:
+                    server.failed_calls += 1
+                    raise
+                await asyncio.sleep(0.01)  # a round-trip
+                return f"{name}({arguments['url']})"
+
+        return FakeSession()
+
+
+def run_with_server(scenario):
+    server = FakeServer()
+    originals = mcp_pool.streamable_http_client, mcp_pool.ClientSession
+    mcp_pool.streamable_http_client, mcp_pool.ClientSession = server.transport, server.session
+    try:
+        asyncio.run(scenario(server))
+    finally:
+        mcp_pool.streamable_http_client, mcp_pool.ClientSession = originals
+    return server
+
+
+async def call(pool, url="https://learn.example/a"):
+    return await pool.call_tool("fetch", {"url": url})
+
+
+def test_reuse_and_close():
+    async def scenario(server):
+        pool = McpSessionPool("https://mcp.example", size=2)
+        assert await call(pool) == "fetch(https://learn.example/a)"
+        await call(pool)
+        assert server.opened == 1
+        await asyncio.gather(call(pool), call(pool))
+        assert server.opened == 2
+        await pool.close()
+        assert pool._idle == [] and pool._reaper is None
+
+    server = run_with_server(scenario)
+    assert server.closed == server.opened == 2
+    # Each transport was entered and exited by its owner task
+    assert server.owner_mismatches == 0
+
+
+def test_retry_uses_new_connection():
+    async def scenario(server):
+        pool = McpSessionPool("https://mcp.example", size=2)
+        await asyncio.gather(call(pool), call(pool))
+        assert len(pool._idle) == 2
+        server.restart()
+        # Both pooled sessions are stale and still "recently used", so no ping catches them
+        assert await call(pool) == "fetch(https://learn.example/a)"
+        assert server.failed_calls == 1
+        assert server.opened == 3
+        assert len(pool._idle) == 1
+        await pool.close()
+
+    server = run_with_server(scenario)
+    assert server.closed == 3
+
+
+def test_ping_before_reuse():
+    async def scenario(server):
+        pool = McpSessionPool("https://mcp.example", health_check_after=0)
+        await call(pool)
+        server.restart()
+        await call(pool)
+        # The stale session failed its ping and was replaced before the call
+        assert server.pings == 1 and server.failed_calls == 0
+        assert server.opened == 2
+        await pool.close()
+
+    run_with_server(scenario)
+
+
+def test_idle_reaper():
+    async def scenario(server):
+        pool = McpSessionPool("https://mcp.example", idle_timeout=0.2)
+        await call(pool)
+        assert len(pool._idle) == 1
+        await asyncio.sleep(1.2)  # the reaper wakes up at least once a second
+        assert pool._idle == []
+        assert server.closed == 1
+        await pool.close()
+
+    run_with_server(scenario)
+
+
+if __name__ == "__main__":
+    test_reuse_and_close()
+    test_retry_uses_new_connection()
+    test_ping_before_reuse()
+    test_idle_reaper()
+    print("MCP session pool checks passed.")
@@ -0,0 +1,34 @@
+"""
+Check parse_meter against recorded outputs for every distinct meter in the
+pricing snapshots plus a set of edge-case meter names.
+Run from project root: python tests/test_meter_parser.py
+"""
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from utils.meter_parser import parse_meter
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "meter_parser_golden.json")
+
+
+def test_parse_meter_matches_golden():
+    with open(GOLDEN_PATH) as f:
+        golden = json.load(f)
+
+    mismatches = []
+    for (meter, sku, product), expected in golden:
+        actual = dict(parse_meter(meter, sku, product))
+        if actual != expected:
+            mismatches.append((meter, product, expected, actual))
+
+    for meter, product, expected, actual in mismatches[:10]:
+        print(f"  {meter!r} ({product}):\n    expected {expected}\n    actual   {actual}")
+    assert not mismatches, f"{len(mismatches)} of {len(golden)} meters parsed differently"
+    print(f"All {len(golden)} meters match.")
+
+
+if __name__ == "__main__":
+    test_parse_meter_matches_golden()
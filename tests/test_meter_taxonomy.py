@@ -0,0 +1,54 @@
+"""
+Round-trip a meter taxonomy file, and check that missing, malformed or
+outdated files are ignored (load_taxonomy returns 0) instead of raising.
+Run from project root: python tests/test_meter_taxonomy.py
+"""
+import json
+import sys
+import os
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import utils.meter_parser as meter_parser
+from utils.meter_parser import PARSER_VERSION, is_seeded
+from utils.meter_taxonomy import load_taxonomy, save_taxonomy
+
+PRICES = {"eastus": [{"Meter": "gpt 4o 0806 Inp glbl Tokens", "SkuName": "gpt 4o 0806 Inp glbl", "Product": "Azure OpenAI"}]}
+
+MALFORMED = [
+    "not json",
+    "[]",
+    json.dumps({"parser_version": PARSER_VERSION}),
+    json.dumps({"parser_version": PARSER_VERSION, "fields": ["model"], "meters": None}),
+    json.dumps({"parser_version": PARSER_VERSION, "fields": ["model"], "meters": [["only", "two"]]}),
+    json.dumps({"parser_version": PARSER_VERSION, "fields": 5, "meters": [["m", "s", "p", ["x"]]]}),
+]
+
+
+def test_round_trip():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "meter_taxonomy.json")
+        assert save_taxonomy(PRICES, path) == (1, 1)
+        try:
+            assert load_taxonomy(path) == 1
+            assert is_seeded("gpt 4o 0806 Inp glbl Tokens", "gpt 4o 0806 Inp glbl", "Azure OpenAI")
+        finally:
+            meter_parser._seeded.clear()
+
+
+def test_bad_files_ignored():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "meter_taxonomy.json")
+        assert load_taxonomy(path) == 0
+        for content in MALFORMED + [json.dumps({"parser_version": "0", "fields": [], "meters": []})]:
+            with open(path, "w") as f:
+                f.write(content)
+            assert load_taxonomy(path) == 0, content
+        assert not meter_parser._seeded
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_bad_files_ignored()
+    print("Meter taxonomy checks passed.")
@@ -0,0 +1,110 @@
+"""
+Record a few weekly snapshots in a throwaway pricing history database and
+check point-in-time and "changes since" queries, and that the database is
+rebuilt from its text change log.
+Run from project root: python tests/test_price_history.py
+"""
+import sys
+import os
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from utils.price_history import PriceHistory, read_log
+
+
+def item(meter, price):
+    return {"Meter": meter, "Price": price, "Unit": "1K", "Product": "Azure OpenAI"}
+
+
+WEEKS = [
+    ("2026-01-05T09:00:00+00:00", {"eastus": [item("gpt 4o inp gl", 0.0025), item("o1 inp gl", 0.015)]}),
+    ("2026-01-12T09:00:00+00:00", {"eastus": [item("gpt 4o inp gl", 0.0025), item("o1 inp gl", 0.015)]}),
+    ("2026-01-19T09:00:00+00:00", {"eastus": [item("gpt 4o inp gl", 0.002), item("o3 inp gl", 0.002)]}),
+    ("2026-01-26T09:00:00+00:00", {"eastus": [item("gpt 4o inp gl", "N/A"), item("o3 inp gl", 0.002)]}),
+]
+
+
+def test_price_history():
+    with tempfile.TemporaryDirectory() as tmp:
+        with PriceHistory(os.path.join(tmp, "history.sqlite")) as history:
+            written = [history.record_snapshot(ts, prices) for ts, prices in WEEKS]
+            assert written == [2, 0, 3, 1]
+            assert history.record_snapshot(*WEEKS[-1]) is None
+
+            assert history.price_at("eastus", "gpt 4o inp gl", "2026-01-04") is None
+            assert history.price_at("eastus", "gpt 4o inp gl", "2026-01-05") == 0.0025
+            assert history.price_at("eastus", "gpt 4o inp gl", "2026-01-18") == 0.0025
+            assert history.price_at("eastus", "gpt 4o inp gl", "2026-01-19T09:00:00+00:00") == 0.002
+            assert history.price_at("eastus", "gpt 4o inp gl", "2026-02-01") == "N/A"
+            assert history.price_at("eastus", "o1 inp gl", "2026-01-20") is None
+            assert history.price_at("westus", "o1 inp gl", "2026-01-20") is None
+
+            changes = history.changes_since("2026-01-06")
+            assert [(c["meter"], c["change_type"], c["change_pct"]) for c in changes] == [
+                ("gpt 4o inp gl", "decreased", -20.0),
+                ("o1 inp gl", "removed", None),
+                ("o3 inp gl", "new", None),
+                ("gpt 4o inp gl", "changed", None),
+            ]
+
+        # A reopened store continues from the recorded state
+        with PriceHistory(os.path.join(tmp, "history.sqlite")) as history:
+            assert history.record_snapshot("2026-02-02T09:00:00+00:00", WEEKS[-1][1]) == 0
+
+
+def dump(history):
+    return (
+        [tuple(row) for row in history.conn.execute("SELECT * FROM snapshots ORDER BY observed_at")],
+        [tuple(row) for row in history.conn.execute("SELECT * FROM prices ORDER BY observed_at, region, meter")],
+    )
+
+
+def test_change_log():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path, log_path = os.path.join(tmp, "history.sqlite"), os.path.join(tmp, "history.jsonl")
+        with PriceHistory(db_path) as history:
+            for timestamp, prices in WEEKS[:3]:
+                history.record_snapshot(timestamp, prices)
+        assert [(ts, count, len(rows)) for ts, count, rows in read_log(log_path)] == [
+            ("2026-01-05T09:00:00+00:00", 2, 2), ("2026-01-12T09:00:00+00:00", 2, 0), ("2026-01-19T09:00:00+00:00", 2, 3),
+        ]
+
+        behind_path = os.path.join(tmp, "behind.sqlite")
+        shutil.copy(db_path, behind_path)
+
+        # A weekly run only appends to the log
+        with open(log_path) as f:
+            before = f.read()
+        with PriceHistory(db_path) as history:
+            history.record_snapshot(*WEEKS[3])
+            expected_all = dump(history)
+        with open(log_path) as f:
+            assert f.read().startswith(before)
+
+        # A fresh checkout has only the log: the database is rebuilt from it
+        os.remove(db_path)
+        with PriceHistory(db_path) as history:
+            assert dump(history) == expected_all
+
+        # A database behind the log catches up; one with snapshots the log lacks is rebuilt
+        with PriceHistory(behind_path, log_path) as history:
+            assert dump(history) == expected_all
+        with PriceHistory(os.path.join(tmp, "ahead.sqlite"), log_path) as history:
+            history._insert("2026-03-01T00:00:00+00:00", 0, [])
+        with PriceHistory(os.path.join(tmp, "ahead.sqlite"), log_path) as history:
+            assert dump(history) == expected_all
+
+        # A database from before the log existed is written out as the log
+        os.remove(log_path)
+        with PriceHistory(db_path):
+            pass
+        with PriceHistory(os.path.join(tmp, "copy.sqlite"), log_path) as history:
+            assert dump(history) == expected_all
+
+
+if __name__ == "__main__":
+    test_price_history()
+    test_change_log()
+    print("Price history checks passed.")
@@ -0,0 +1,100 @@
+"""
+Check the vectorized pricing diff on a small hand-made pair of snapshots
+covering every change type, duplicate meters, "N/A" prices and zero prices.
+Run from project root: python tests/test_pricing_diff.py
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from utils.fingerprints import pricing_fingerprints
+from utils.pricing_diff import CHANGE_FIELDS, diff_pricing
+from utils.snapshot_store import SnapshotColumns
+
+
+def item(meter, price, product="Azure OpenAI"):
+    return {"Meter": meter, "Price": price, "Unit": "1K", "Product": product}
+
+
+PREVIOUS = {
+    "westus": [
+        item("gpt 4o inp gl", 0.0025),
+        item("gpt 4o opt gl", 0.01),
+        item("o3 inp gl", 0.0),
+        item("o1 inp gl", 0.015),
+        item("gpt 4o cd inp gl", "N/A"),
+    ],
+    "eastus": [
+        item("gpt 4o inp gl", 0.0025),
+        item("gpt 4o inp gl", 0.003),   # duplicate: the last price wins
+        item("gpt 4o opt gl", 1),
+    ],
+    "oldregion": [item("gpt 4o inp gl", 0.0025)],
+}
+
+CURRENT = {
+    "eastus": [
+        item("gpt 4o mini inp gl", 0.00015),
+        item("gpt 4o inp gl", 0.003),
+        item("gpt 4o opt gl", 2),
+    ],
+    "westus": [
+        item("o3 inp gl", 0.002),
+        item("gpt 4o opt gl", 0.008),
+        item("gpt 4o inp gl", 0.0025),
+        item("gpt 4o cd inp gl", 0.00125),
+        item("gpt 5 inp gl", 0.00125),
+        item("gpt 5 inp gl", 0.0013),   # duplicate: first position, last price
+    ],
+}
+
+EXPECTED = [
+    ("eastus", "gpt 4o mini inp gl", "new", None, 0.00015, None),
+    ("eastus", "gpt 4o opt gl", "increased", 1, 2, 100.0),
+    ("oldregion", "gpt 4o inp gl", "removed", 0.0025, None, None),
+    ("westus", "o3 inp gl", "increased", 0.0, 0.002, 100.0),
+    ("westus", "gpt 4o opt gl", "decreased", 0.01, 0.008, -20.0),
+    ("westus", "gpt 5 inp gl", "new", None, 0.0013, None),
+    ("westus", "o1 inp gl", "removed", 0.015, None, None),
+]
+
+
+def check(changes):
+    actual = [
+        (c["region"], c["meter"], c["change_type"], c["old_price"], c["new_price"], c["change_pct"])
+        for c in changes
+    ]
+    assert actual == EXPECTED, f"\n  expected {EXPECTED}\n  actual   {actual}"
+    # Original price objects are kept: int prices stay ints
+    assert [(type(a[3]), type(a[4])) for a in actual] == [(type(e[3]), type(e[4])) for e in EXPECTED]
+    assert all(field in c for c in changes for field in CHANGE_FIELDS)
+
+
+def test_diff_pricing_dicts():
+    check(diff_pricing(PREVIOUS, CURRENT))
+
+
+def test_diff_pricing_columns():
+    check(diff_pricing(SnapshotColumns.from_prices(PREVIOUS, "t"), SnapshotColumns.from_prices(CURRENT, "t")))
+
+
+def test_diff_pricing_fingerprints():
+    # Unchanged regions/models are skipped, but the result must not change
+    unchanged_region = {"centralus": [item("gpt 4o inp gl", 0.0025), item("o1 inp gl", 0.015)]}
+    previous, current = {**PREVIOUS, **unchanged_region}, {**CURRENT, **unchanged_region}
+    check(diff_pricing(previous, current, pricing_fingerprints(previous), pricing_fingerprints(current)))
+
+
+def test_diff_pricing_no_changes():
+    assert diff_pricing(CURRENT, CURRENT) == []
+    fingerprints = pricing_fingerprints(CURRENT)
+    assert diff_pricing(CURRENT, CURRENT, fingerprints, fingerprints) == []
+
+
+if __name__ == "__main__":
+    test_diff_pricing_dicts()
+    test_diff_pricing_columns()
+    test_diff_pricing_fingerprints()
+    test_diff_pricing_no_changes()
+    print("All diff checks passed.")
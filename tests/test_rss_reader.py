@@ -0,0 +1,110 @@
+"""
+Read the recorded AWS and Azure status feeds with the streaming RSS reader,
+check the extracted fields against the items feedparser produced for the
+same feeds (recorded in fixtures/rss_items_expected.json), and check that
+slightly malformed feeds are recovered item by item.
+Run from project root: python tests/test_rss_reader.py
+"""
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from utils.rss_reader import iter_rss_items
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+FEEDS = ["aws_bedrock_status.rss", "azure_status.rss"]
+
+ATOM_FEED = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Status</title>
+  <link href="https://status.example.com/"/>
+  <entry>
+    <title>Elevated errors</title>
+    <link rel="alternate" href="https://status.example.com/incidents/1"/>
+    <updated>2026-03-05T17:12:44Z</updated>
+    <summary>Investigating.</summary>
+  </entry>
+</feed>
+"""
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+        return f.read()
+
+
+def test_aws_fields():
+    items = list(iter_rss_items([read_fixture("aws_bedrock_status.rss")]))
+    assert len(items) == 3
+    assert items[0] == {
+        "title": "Informational message: Increased Invocation Latency",
+        "summary": "We are investigating increased invocation latencies for some models in the US-EAST-1 Region. "
+                   "Requests are succeeding, and we are working to identify the root cause.",
+        "published": "Thu, 05 Mar 2026 11:42:00 PST",
+        "link": "http://status.aws.amazon.com/",
+    }
+    assert ["operating normally" in item["summary"] for item in items] == [False, True, True]
+
+
+def test_chunks_and_limit():
+    for name in FEEDS:
+        data = read_fixture(name)
+        expected = list(iter_rss_items([data]))
+        assert list(iter_rss_items([data[i:i + 7] for i in range(0, len(data), 7)])) == expected
+        assert list(iter_rss_items([data], limit=1)) == expected[:1]
+
+
+def test_atom():
+    assert list(iter_rss_items([ATOM_FEED])) == [{
+        "title": "Elevated errors",
+        "summary": "Investigating.",
+        "published": "2026-03-05T17:12:44Z",
+        "link": "https://status.example.com/incidents/1",
+    }]
+
+
+def recorded_items():
+    with open(os.path.join(FIXTURES_DIR, "rss_items_expected.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_matches_feedparser():
+    expected = recorded_items()
+    for name in FEEDS:
+        assert list(iter_rss_items([read_fixture(name)])) == expected[name], name
+
+
+def test_malformed_feeds():
+    expected = recorded_items()
+
+    # An undefined entity inside the second item: items after it are still read
+    aws = read_fixture("aws_bedrock_status.rss").replace(b"10:37:00 PST</pubDate>", b"10:37:00 PST &nbsp;</pubDate>")
+    # A stray "&" in the first item's title, and one before any item
+    azure = read_fixture("azure_status.rss").replace(b"in East US 2</title>", b"in East US & 2</title>")
+    azure_title = expected["azure_status.rss"][0]["title"].replace("East US 2", "East US & 2")
+    azure_early = read_fixture("azure_status.rss").replace(b"<title>Azure Status</title>", b"<title>Azure & Status</title>")
+
+    for data, name, changes in [
+        (aws, "aws_bedrock_status.rss", {}),
+        (azure, "azure_status.rss", {0: {"title": azure_title}}),
+        (azure_early, "azure_status.rss", {}),
+    ]:
+        wanted = [{**item, **changes.get(n, {})} for n, item in enumerate(expected[name])]
+        assert list(iter_rss_items([data])) == wanted, name
+        assert list(iter_rss_items([data[i:i + 7] for i in range(0, len(data), 7)])) == wanted, name
+        assert list(iter_rss_items([data], limit=1)) == wanted[:1], name
+
+    # Truncated mid-item: the complete items are kept
+    truncated = read_fixture("aws_bedrock_status.rss")[:-200]
+    assert list(iter_rss_items([truncated])) == expected["aws_bedrock_status.rss"][:2]
+
+
+if __name__ == "__main__":
+    test_aws_fields()
+    test_chunks_and_limit()
+    test_atom()
+    test_matches_feedparser()
+    test_malformed_feeds()
+    print("All RSS reader checks passed.")
@@ -0,0 +1,171 @@
+"""
+Check the MCP server's pricing tool with a slow pricing fetch (no network):
+another tool call must finish while the fetch is still running, because the
+disk cache, JSON decoding and meter parsing run off the event loop. With a
+fake fetch, checks that concurrent cold callers share one fetch (and that
+one of them giving up doesn't cancel it for the rest), that stale entries
+are served while they refresh, that a hung fetch times out, and that the
+per-region cache is bounded and skips empty results.
+Run from project root: python tests/test_server.py
+"""
+import asyncio
+import json
+import sys
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import providers.azure as azure
+import server
+from utils.http_cache import DiskCache
+
+PAGE = {
+    "Items": [{
+        "meterName": "gpt 4o 0806 Inp glbl Tokens",
+        "retailPrice": 0.0025,
+        "unitOfMeasure": "1K",
+        "productName": "Azure OpenAI",
+        "skuName": "gpt 4o 0806 Inp glbl",
+    }],
+    "NextPageLink": None,
+}
+
+
+def test_tool_call_during_slow_fetch():
+    real_group_items = azure._group_items
+
+    def slow_group_items(items):
+        time.sleep(0.5)  # blocking, like parsing a large region
+        return real_group_items(items)
+
+    async def scenario():
+        started = time.monotonic()
+        slow = asyncio.create_task(server.get_model_pricing("slowregion"))
+        await asyncio.sleep(0.05)
+        text = await server.get_model_pricing("eastus")
+        elapsed = time.monotonic() - started
+        assert not slow.done()
+        return text, elapsed, await slow
+
+    original_cache = azure.pricing_cache
+    with tempfile.TemporaryDirectory() as tmp:
+        azure.pricing_cache = DiskCache(tmp, ttl=3600)
+        azure.pricing_cache.put(azure._regional_pricing_url("slowregion"), json.dumps(PAGE), {})
+        azure._group_items = slow_group_items
+        server._pricing_cache["eastus"] = server.PricingEntry({}, "cached eastus pricing", time.monotonic())
+        try:
+            text, elapsed, slow_text = asyncio.run(scenario())
+        finally:
+            azure.pricing_cache = original_cache
+            azure._group_items = real_group_items
+            server._pricing_cache.clear()
+
+    assert text == "cached eastus pricing"
+    assert elapsed < 0.3, elapsed  # the slow fetch blocks for 0.5s
+    assert "GPT-4o" in slow_text, slow_text
+
+
+@contextmanager
+def fake_fetch(delay=0.0, **settings):
+    """
+    Replace the upstream fetch with one that answers after `delay` seconds and
+    records the regions it was called for. `settings` override server constants.
+    """
+    fetched = []
+
+    async def fetch(region):
+        fetched.append(region)
+        await asyncio.sleep(delay)
+        return {} if region.startswith("nowhere") else {"GPT-4o": {"Global": {"Standard": {"Input": len(fetched)}}}}
+
+    originals = {name: getattr(server, name) for name in ["fetch_grouped_pricing_async", *settings]}
+    for name, value in {"fetch_grouped_pricing_async": fetch, **settings}.items():
+        setattr(server, name, value)
+    try:
+        yield fetched
+    finally:
+        for name, value in originals.items():
+            setattr(server, name, value)
+        server._pricing_cache.clear()
+
+
+def test_single_flight():
+    async def scenario():
+        return await asyncio.gather(*[server.get_cached_pricing("eastus") for _ in range(10)])
+
+    with fake_fetch(0.1) as fetched:
+        entries = asyncio.run(scenario())
+    assert fetched == ["eastus"], fetched
+    assert all(entry is entries[0] for entry in entries)
+
+
+def test_cancelled_caller():
+    async def scenario():
+        impatient = asyncio.create_task(server.get_cached_pricing("eastus"))
+        patient = asyncio.create_task(server.get_cached_pricing("eastus"))
+        await asyncio.sleep(0.05)
+        impatient.cancel()
+        entry = await patient
+        return impatient.cancelled(), entry
+
+    # The shield keeps the shared fetch running for the caller that stayed
+    with fake_fetch(0.2) as fetched:
+        cancelled, entry = asyncio.run(scenario())
+        assert "eastus" in server._pricing_cache
+    assert cancelled
+    assert fetched == ["eastus"], fetched
+    assert entry.grouped["GPT-4o"]
+
+
+def test_stale_while_revalidate():
+    async def scenario():
+        first = await server.get_cached_pricing("eastus")
+        started = time.monotonic()
+        stale = [await server.get_cached_pricing("eastus") for _ in range(3)]
+        served_in = time.monotonic() - started
+        await asyncio.gather(*server._background_tasks)
+        return first, stale, served_in, server._pricing_cache["eastus"]
+
+    with fake_fetch(0.2, PRICING_CACHE_TTL=0) as fetched:
+        first, stale, served_in, refreshed = asyncio.run(scenario())
+    assert all(entry is first for entry in stale) and served_in < 0.1, served_in
+    assert refreshed is not first
+    assert refreshed.grouped["GPT-4o"]["Global"]["Standard"]["Input"] == 2
+    # Stale reads during a refresh don't start another one
+    assert fetched == ["eastus", "eastus"], fetched
+
+
+def test_fetch_timeout():
+    started = time.monotonic()
+    with fake_fetch(10, PRICING_FETCH_TIMEOUT=0.2, pricing_snapshot=None):
+        text = asyncio.run(server.get_model_pricing("eastus"))
+        assert not server._pricing_cache
+    assert text.startswith("Timed out after 0.2s"), text
+    assert time.monotonic() - started < 1
+
+
+def test_cache_bounded():
+    async def scenario():
+        for region in ["a", "b", "c", "a", "d", "nowhere1", "nowhere1"]:
+            await server.get_cached_pricing(region)
+        return list(server._pricing_cache)
+
+    with fake_fetch(PRICING_CACHE_MAX_REGIONS=3) as fetched:
+        regions = asyncio.run(scenario())
+
+    # "b" was least recently used when "d" arrived; empty results are fetched every time
+    assert regions == ["c", "a", "d"], regions
+    assert fetched == ["a", "b", "c", "d", "nowhere1", "nowhere1"], fetched
+
+
+if __name__ == "__main__":
+    test_tool_call_during_slow_fetch()
+    test_single_flight()
+    test_cancelled_caller()
+    test_stale_while_revalidate()
+    test_fetch_timeout()
+    test_cache_bounded()
+    print("Server checks passed.")
@@ -0,0 +1,67 @@
+"""
+Round-trip pricing snapshots through every on-disk encoding and check that
+loaders see exactly what was saved.
+Run from project root: python tests/test_snapshot_store.py
+"""
+import json
+import sys
+import os
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from utils.records import records_to_dicts
+from utils.snapshot_store import load_snapshot, save_snapshot
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+def item(meter, price, product="Azure OpenAI", unit="1K", sku=""):
+    return {"Meter": meter, "Price": price, "Unit": unit, "Product": product, "SkuName": sku}
+
+
+PRICES = {
+    "eastus": [item("gpt 4o inp gl", 0.0025), item("gpt 4o opt gl", 0.01), item("o1 inp gl", "N/A")],
+    "westus": [item("gpt 4o inp gl", 0.0025), item("gpt 4o opt gl", 1)],
+    "unsorted": [item("o1 inp gl", 0.015), item("gpt 4o inp gl", 0.0025)],
+    "repeated": [item("gpt 4o inp gl", 0.0025), item("gpt 4o inp gl", 0.003)],
+    "empty": [],
+}
+
+
+def round_trip(prices, suffix):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, f"pricing{suffix}")
+        save_snapshot(path, prices, "2026-01-05T09:00:00+00:00")
+        return load_snapshot(path)
+
+
+def test_round_trip():
+    for suffix in (".json", ".npz"):
+        data = round_trip(PRICES, suffix)
+        # json.dumps also compares key order and int vs float prices
+        assert json.dumps(records_to_dicts(data["prices"])) == json.dumps(PRICES), suffix
+        assert data["timestamp"] == "2026-01-05T09:00:00+00:00"
+        assert set(data["fingerprints"]["regions"]) == set(PRICES)
+
+
+def test_round_trip_committed_snapshot():
+    original = load_snapshot(os.path.join(DATA_DIR, "pricing_current.json"))
+    for suffix in (".json", ".npz"):
+        data = round_trip(original["prices"], suffix)
+        assert records_to_dicts(data["prices"]) == records_to_dicts(original["prices"]), suffix
+
+
+def test_load_falls_back_to_other_format():
+    with tempfile.TemporaryDirectory() as tmp:
+        save_snapshot(os.path.join(tmp, "pricing.json"), PRICES, "2026-01-05T09:00:00+00:00")
+        data = load_snapshot(os.path.join(tmp, "pricing.npz"))
+        assert json.dumps(records_to_dicts(data["prices"])) == json.dumps(PRICES)
+        assert load_snapshot(os.path.join(tmp, "missing.npz")) is None
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_round_trip_committed_snapshot()
+    test_load_falls_back_to_other_format()
+    print("All snapshot round-trips match.")
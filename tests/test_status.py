@@ -0,0 +1,171 @@
+"""
+Check the concurrent status fan-out with fake providers (no network): slow
+providers are hedged or cut off at their budget, failures become UNKNOWN,
+and the whole check ends by the deadline. Also checks that unchanged
+status pages are answered from the conditional-request cache (ignoring
+entries written in another parse format), and that
+statuspage providers take their health from the monitored components.
+Run from project root: python tests/test_status.py
+"""
+import asyncio
+import json
+import sys
+import os
+import tempfile
+import time
+from datetime import datetime
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import providers.status as status
+from providers.status import ProviderStatus, ServiceHealth, StatusSource, fetch_all_statuses_async
+from utils.http_cache import DiskCache
+
+
+def fake_source(name, *delays):
+    """A provider whose n-th attempt answers after delays[n] seconds (None: raises)."""
+    attempts = []
+
+    async def fetch(async_client):
+        delay = delays[min(len(attempts), len(delays) - 1)]
+        attempts.append(delay)
+        if delay is None:
+            raise ConnectionError(f"{name} unreachable")
+        await asyncio.sleep(delay)
+        return ProviderStatus(name, ServiceHealth.OPERATIONAL, "All Systems Operational", datetime.utcnow())
+
+    source = StatusSource(name, f"https://{name}.example", fetch)
+    source.attempts = attempts
+    return source
+
+
+def check(sources, **limits):
+    started = time.monotonic()
+    statuses = asyncio.run(fetch_all_statuses_async(sources, **limits))
+    return statuses, time.monotonic() - started
+
+
+def test_concurrent_with_budget():
+    sources = [fake_source("fast", 0.1), fake_source("slow", 0.3), fake_source("hung", 10), fake_source("down", None)]
+    statuses, elapsed = check(sources, deadline=5, provider_timeout=0.5, hedge_after=0)
+    assert [s.provider for s in statuses] == ["fast", "slow", "hung", "down"]
+    assert [s.status for s in statuses] == [ServiceHealth.OPERATIONAL] * 2 + [ServiceHealth.UNKNOWN] * 2
+    assert statuses[2].error == "timeout"
+    assert statuses[3].error == "down unreachable"
+    assert elapsed < 1, elapsed  # bounded by the budget, not the sum or the hung provider
+
+
+def test_hedged_retry():
+    # First attempt hangs, the hedge answers; a fast failure is retried once
+    slow_first, flaky = fake_source("slow-first", 10, 0.1), fake_source("flaky", None, 0.1)
+    statuses, elapsed = check([slow_first, flaky], deadline=5, provider_timeout=2, hedge_after=0.2)
+    assert [s.status for s in statuses] == [ServiceHealth.OPERATIONAL] * 2
+    assert slow_first.attempts == [10, 0.1] and flaky.attempts == [None, 0.1]
+    assert elapsed < 1, elapsed
+
+
+def test_global_deadline():
+    statuses, elapsed = check([fake_source("fast", 0.1), fake_source("hung", 10)],
+                              deadline=0.5, provider_timeout=30, hedge_after=0)
+    assert [s.status for s in statuses] == [ServiceHealth.OPERATIONAL, ServiceHealth.UNKNOWN]
+    assert elapsed < 1, elapsed
+
+
+GCP_INCIDENTS = [
+    {"service_name": "Vertex Gemini API", "external_desc": "Elevated errors", "begin": "2026-01-05", "end": "", "number": "1"},
+    {"service_name": "Cloud Storage", "external_desc": "Slow uploads", "begin": "2026-01-04", "end": "", "number": "2"},
+]
+
+
+def test_conditional_requests():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=GCP_INCIDENTS, headers={"ETag": '"v1"'})
+
+    async def fetch_twice():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as async_client:
+            return [await status._fetch_gcp_vertex(async_client) for _ in range(2)]
+
+    original_cache = status.status_cache
+    with tempfile.TemporaryDirectory() as tmp:
+        status.status_cache = DiskCache(tmp, ttl=0)
+        try:
+            first, second = asyncio.run(fetch_twice())
+        finally:
+            status.status_cache = original_cache
+
+    assert [r.headers.get("if-none-match") for r in requests] == [None, '"v1"']
+    assert first.status == second.status == ServiceHealth.DEGRADED
+    assert json.dumps(first.incidents) == json.dumps(second.incidents)
+    assert [inc["title"] for inc in second.incidents] == ["Elevated errors"]
+
+
+def test_cache_format_mismatch():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=GCP_INCIDENTS, headers={"ETag": '"v1"'})
+
+    async def fetch():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as async_client:
+            return await status._fetch_gcp_vertex(async_client)
+
+    original_cache = status.status_cache
+    with tempfile.TemporaryDirectory() as tmp:
+        status.status_cache = DiskCache(tmp, ttl=0)
+        try:
+            # An entry in an older shape (the bare parse result) with a matching ETag
+            status.status_cache.put("https://status.cloud.google.com/incidents.json", [{"stale": True}], {"etag": '"v1"'})
+            result = asyncio.run(fetch())
+        finally:
+            status.status_cache = original_cache
+
+    # Not revalidated: the page was downloaded and parsed again
+    assert [r.headers.get("if-none-match") for r in requests] == [None]
+    assert result.status == ServiceHealth.DEGRADED
+
+
+def test_statuspage_components():
+    with open(os.path.join(os.path.dirname(__file__), "fixtures", "statuspage_summary.json")) as f:
+        summary = json.load(f)
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.path)
+        return httpx.Response(200, json=summary)
+
+    async def fetch():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as async_client:
+            return await status._fetch_anthropic(async_client)
+
+    # Only claude.ai is degraded: the API is what we monitor
+    result = asyncio.run(fetch())
+    assert requests == ["/api/v2/summary.json"]
+    assert result.status == ServiceHealth.OPERATIONAL
+    assert result.components == [{"name": "Claude API (api.anthropic.com)", "status": "operational"}]
+    assert result.description == "Minor Service Outage (monitored components operational)"
+    assert [inc["title"] for inc in result.incidents] == ["Elevated errors on claude.ai"]
+
+    summary["components"][2]["status"] = "partial_outage"
+    result = asyncio.run(fetch())
+    assert result.status == ServiceHealth.PARTIAL_OUTAGE
+    assert result.description == "Claude API (api.anthropic.com): partial outage"
+
+
+if __name__ == "__main__":
+    test_concurrent_with_budget()
+    test_hedged_retry()
+    test_global_deadline()
+    test_conditional_requests()
+    test_cache_format_mismatch()
+    test_statuspage_components()
+    print("Status fan-out checks passed.")